@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .entities import BLOB_STATE, BRAIN_LAYERS, Blob, BlobTable
+from .genomes import HALL_DTYPE, HallOfFame
+from .simulation import Simulation, SimulationParams
+
+# Bumped whenever the set or meaning of the stored arrays changes
+CHECKPOINT_VERSION: int = 3
+# Per-blob arrays, one row per blob, stored as ``blob_<name>``; brain
+# weights are stored as ``blob_weight_<layer>``
+BLOB_FIELDS: list[str] = [*BlobTable.COLUMNS, *BLOB_STATE]
+
+
+def capture_checkpoint(sim: Simulation) -> dict[str, np.ndarray]:
+    """Copy the whole world state of ``sim`` into named columnar arrays.
+
+    Holds one row per live blob in registry order (the order turns visit
+    them), the food grid, turn counter, parameters, the next blob id, the
+    state of the simulation's random generator and the hall of fame. The
+    arrays are copies, so they can be written out while the simulation
+    carries on.
+    """
+    grid = sim.grid
+    table = grid.blobs
+    slots = table.live_slots()
+    states = [blob.state() for blob in table.live_blobs()]
+    arrays: dict[str, np.ndarray] = {
+        "version": np.array(CHECKPOINT_VERSION),
+        "turn": np.array(sim.turn),
+        "next_id": np.array(Blob.NEXT_ID),
+        "food": grid.food.copy(),
+    }
+    for name, (dtype, shape) in BLOB_STATE.items():
+        arrays[f"blob_{name}"] = np.array(
+            [state[name] for state in states], dtype=dtype
+        ).reshape(len(states), *shape)
+    hall = sim.hall_of_fame
+    arrays["hall_entries"] = hall.entries.copy()
+    arrays["hall_capacity"] = np.array(hall.capacity)
+    arrays["hall_quantum"] = np.array(hall.quantum)
+    arrays["hall_terms"] = np.array(list(hall.weights), dtype=str)
+    arrays["hall_weights"] = np.array(list(hall.weights.values()), dtype=np.float64)
+    for name, value in asdict(sim.params).items():
+        arrays[f"param_{name}"] = np.array(value)
+    for name in table.COLUMNS:
+        arrays[f"blob_{name}"] = getattr(table, name)[slots]
+    for layer, column in enumerate(table.weights):
+        arrays[f"blob_weight_{layer}"] = column[slots]
+    # The bit generator state holds integers wider than any numpy dtype
+    arrays["rng_state"] = np.array(json.dumps(sim.rng.bit_generator.state))
+    return arrays
+
+
+def write_checkpoint(
+    arrays: dict[str, Any], path: str | Path, compress: bool = False
+) -> None:
+    save = np.savez_compressed if compress else np.savez
+    save(path, **arrays)
+
+
+def save_checkpoint(
+    sim: Simulation,
+    path: str | Path,
+    background: bool = False,
+    compress: bool = False,
+) -> threading.Thread | None:
+    """Write the world state of ``sim`` to the ``.npz`` file at ``path``.
+
+    Only the copy into arrays happens on the calling thread. With
+    ``background`` the file is written by a new thread, which is returned so
+    the caller can ``join()`` it; the simulation may keep stepping meanwhile.
+    ``compress`` trades write time for a smaller file.
+    """
+    arrays = capture_checkpoint(sim)
+    if not background:
+        write_checkpoint(arrays, path, compress)
+        return None
+    writer = threading.Thread(
+        target=write_checkpoint,
+        args=(arrays, path, compress),
+        name="checkpoint-writer",
+    )
+    writer.start()
+    return writer
+
+
+def load_checkpoint(path: str | Path) -> Simulation:
+    """Rebuild the simulation saved at ``path``.
+
+    Also restores ``Blob.NEXT_ID`` and the random generator, so the loaded
+    run continues exactly as the saved one would have.
+    """
+    with np.load(path) as data:
+        version = int(data["version"])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"checkpoint {path} has version {version}, "
+                f"expected {CHECKPOINT_VERSION}"
+            )
+        params = SimulationParams(
+            **{
+                name: data[f"param_{name}"].item()
+                for name in asdict(SimulationParams())
+            }
+        )
+        sim = Simulation(params, populate=False)
+        sim.turn = int(data["turn"])
+        sim.hall_of_fame = HallOfFame(
+            int(data["hall_capacity"]),
+            dict(zip(data["hall_terms"].tolist(), data["hall_weights"].tolist())),
+            float(data["hall_quantum"]),
+        )
+        sim.hall_of_fame.entries = data["hall_entries"].astype(HALL_DTYPE)
+        grid = sim.grid
+        food = data["food"]
+        if food.shape != grid.food.shape:
+            raise ValueError(
+                f"checkpoint {path} has a {food.shape} grid, expected {grid.food.shape}"
+            )
+        grid.food[...] = food
+        grid.food_count = int(np.count_nonzero(food))
+        grid.food_energy = int(food.sum(dtype=np.int64))
+        columns = {name: data[f"blob_{name}"].tolist() for name in BLOB_FIELDS}
+        weights = [data[f"blob_weight_{layer}"] for layer in range(len(BRAIN_LAYERS))]
+        grid.blobs.reserve(len(columns["id"]))
+        for row in range(len(columns["id"])):
+            state = {name: column[row] for name, column in columns.items()}
+            state["weights"] = [w[row] for w in weights]
+            Blob.from_state(grid, state)
+        grid.birth_order = deque(sorted(grid.birth_order, key=lambda b: b.id))
+        Blob.NEXT_ID = int(data["next_id"])
+        rng_state = json.loads(str(data["rng_state"]))
+        bit_generator = getattr(np.random, rng_state["bit_generator"])()
+        bit_generator.state = rng_state
+        sim.rng = np.random.Generator(bit_generator)
+    return sim
@@ -12,6 +12,8 @@ MAX_SPAWN_ENERGY: int = 30
 REPRODUCE_DISTANCE: int = 4
 MOOVE_SPEED: int = 1
 SCAN_RANGE: int = 7
+# Answer nearest-food queries from a grid-wide distance field kept up to date
+FOOD_FIELD: bool = True
 DENSITY_SCAN_RANGE: int = 10
 MUTATION_RATE: float = 0.1
 MUTATION_POWER: float = 0.5
@@ -28,15 +30,39 @@ ACTION_FAIL_PENALTY_INCREMENT: float = 0.4
 ACTION_PENALTY_MAX: float = 1.5
 SOFTMAX_TEMPERATURE_MIN: float = 0.4
 SOFTMAX_TEMPERATURE_MAX: float = 1.2
+# Uniform noise added to every action preference, for exploration
+ACTION_NOISE: float = 0.05
 HIT_COOLDOWN_TURNS: int = 3
 LOOP_PENALTY_INCREMENT: float = 0.2
 LOOP_REPEAT_THRESHOLD: int = 6
+# Recent action codes kept per blob (older ones only survive in the counters)
+BEHAVIOUR_HISTORY: int = 32
 
 # Display parameters (main window must be square)
 # Slightly reduced default size; UI scales dynamically
 WIDTH: int = 860
 HEIGHT: int = 860
 WIDTH_INFO: int = 560
+# Level of detail: sprites from this cell size (px), one pixel per cell down
+# to 1px, then blocks of cells per pixel brightened by this gain
+LOD_SPRITE_MIN_CELL: float = 4.0
+LOD_BLOCK_GAIN: float = 4.0
+# Frames drawn per second by the UI; in turbo mode the simulation thread may
+# spend this many milliseconds of each frame on turns before publishing
+UI_FPS: int = 60
+TURBO_FRAME_BUDGET_MS: float = 12.0
+# World checkpoint written with S and read back with L
+CHECKPOINT_PATH: str = "checkpoint.npz"
+# The oldest blob and the hall of fame of every extinct run are appended
+# here (see genomes.py)
+GENOME_ARCHIVE: str = "oldest.genomes"
+# How long a status message (e.g. a failed checkpoint load) stays on screen
+STATUS_MESSAGE_MS: int = 4000
+# Hall of fame: how many genomes it keeps, how they are ranked ("age",
+# "energy" or "offspring") and every how many turns it is refreshed
+HALL_OF_FAME_SIZE: int = 16
+HALL_OF_FAME_FITNESS: str = "age"
+HALL_OF_FAME_EVERY: int = 10
 
 COLOR: Dict[str, Tuple[int, int, int]] = {
     "WHITE": (255, 255, 255),
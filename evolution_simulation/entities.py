@@ -1,21 +1,38 @@
 from __future__ import annotations
 
-import random as rd
 from collections import deque
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-import pygame
 
 from . import constants as C
-from .state import state
-from .utils import calculate_type_density
+from .utils import (
+    diamond_offsets,
+    nearest_source_transform,
+    quadrant_densities,
+    sample_cells,
+    summed_area_table,
+)
+
+if TYPE_CHECKING:
+    from .simulation import Simulation, SimulationParams
 
 
 def distance(obj1: Any, obj2: Any) -> int:
     return int(abs(obj1.x - obj2.x) + abs(obj1.y - obj2.y))
 
 
+def norm(val: float, scale: float) -> float:
+    if scale == 0:
+        return 0.0
+    v = val / scale
+    if v > 1:
+        return 1.0
+    if v < -1:
+        return -1.0
+    return v
+
+
 def dist_x(source: Any, destination: Any) -> int:
     dx = destination.x - source.x
     # No wrapping: direct difference only
@@ -28,17 +45,101 @@ def dist_y(source: Any, destination: Any) -> int:
     return int(dy)
 
 
+# Behaviour label of each action code: 0=eat, 1-4=move, 5=hit, 6=reproduce
+ACTION_NAMES: list[str] = [
+    "manger",
+    "bas",
+    "haut",
+    "droite",
+    "gauche",
+    "taper",
+    "reproduire",
+]
+
+# (inputs, outputs) of each dense layer of a blob's brain
+BRAIN_LAYERS: list[tuple[int, int]] = [(17, 20), (20, 15), (15, 10), (10, 7)]
+
+# Per-blob fields kept on the ``Blob`` rather than in the ``BlobTable``, with
+# the dtype and shape of one blob's value in ``Blob.state()``
+BLOB_STATE: dict[str, tuple[type, tuple[int, ...]]] = {
+    "id": (np.int64, ()),
+    # (0, 0) for blobs without parents; ids start at 1
+    "parents": (np.int64, (2,)),
+    "mutation_rate": (np.float64, ()),
+    "action_totals": (np.int64, (len(ACTION_NAMES),)),
+    "history": (np.int8, (C.BEHAVIOUR_HISTORY,)),
+    "actions_taken": (np.int64, ()),
+    # Padded with -1 past the blob's number of recent actions
+    "recent_actions": (np.int8, (C.LOOP_REPEAT_THRESHOLD,)),
+    "action_penalties": (np.float64, (len(ACTION_NAMES),)),
+}
+
+# Cells a child may be placed on, relative to its parent
+SPAWN_OFFSETS: np.ndarray = np.array(
+    [
+        offset
+        for d in range(1, C.REPRODUCE_DISTANCE + 1)
+        for offset in [(d, 0), (-d, 0), (0, d), (0, -d)]
+    ]
+)
+
+
 class Brain:
+    """Weights of one blob's policy network.
+
+    A brain attached to a live blob is a view onto that blob's slot in the
+    ``BlobTable`` weight columns, so the whole population can be evaluated with
+    ``BlobTable.predict``. A brain without a blob owns its weights.
+
+    Random weights are drawn from ``rng``, by default the generator of the
+    blob's simulation.
+    """
+
     def __init__(
-        self, blob: Any, input_size: int = 17, output_size: int = 7, n_layer: int = 4
+        self,
+        blob: Any,
+        input_size: int = 17,
+        output_size: int = 7,
+        n_layer: int = 4,
+        rng: np.random.Generator | None = None,
     ) -> None:
-        self.blob = blob
-        self.weight = [
-            np.random.randn(input_size, 20),
-            np.random.randn(20, 15),
-            np.random.randn(15, 10),
-            np.random.randn(10, output_size),
+        if rng is None:
+            rng = blob.sim.rng if blob is not None else np.random.default_rng()
+        self.blob: Blob | None = None
+        self.own_weight: list[np.ndarray] | None = [
+            rng.standard_normal((input_size, 20)),
+            rng.standard_normal((20, 15)),
+            rng.standard_normal((15, 10)),
+            rng.standard_normal((10, output_size)),
         ]
+        if blob is not None:
+            self.attach(blob)
+
+    @classmethod
+    def from_weights(cls, weight: list[np.ndarray], copy: bool = True) -> Brain:
+        brain = cls.__new__(cls)
+        brain.blob = None
+        brain.own_weight = [w.copy() for w in weight] if copy else list(weight)
+        return brain
+
+    @property
+    def weight(self) -> list[np.ndarray]:
+        if self.own_weight is not None:
+            return self.own_weight
+        assert self.blob is not None
+        table = self.blob.grid.blobs
+        return [w[self.blob.slot] for w in table.weights]
+
+    def attach(self, blob: Blob) -> None:
+        """Move the weights into ``blob``'s slot of the weight columns."""
+        table = blob.grid.blobs
+        for column, w in zip(table.weights, self.weight):
+            column[blob.slot] = w
+        self.own_weight = None
+        self.blob = blob
+
+    def detach(self) -> None:
+        self.own_weight = [w.copy() for w in self.weight]
 
     def predict(self, entree: np.ndarray) -> np.ndarray:
         x = entree
@@ -48,48 +149,287 @@ class Brain:
 
 
 class Food:
-    def __init__(self, x: int, y: int, amount: int) -> None:
+    """View on one non-empty cell of ``Grid.food``."""
+
+    def __init__(self, x: int, y: int, amount: int, grid: Grid) -> None:
         self.x = x
         self.y = y
         self.amount = amount
-        self.color = C.COLOR["YELLOW"]
-
-    def draw(self, win: pygame.Surface) -> None:
-        x = self.x * state.CELL_SIZE
-        y = self.y * state.CELL_SIZE
-        if state.image_manager and state.image_manager.food_image:
-            win.blit(state.image_manager.food_image, (x, y))
-        else:
-            center_x = x + state.CELL_SIZE / 2
-            center_y = y + state.CELL_SIZE / 2
-            pygame.draw.circle(
-                win, self.color, (center_x, center_y), state.CELL_SIZE / 4
-            )
+        self.grid = grid
 
     def update(self) -> None:
         pass
 
     def suicide(self) -> None:
-        if state.grid is not None:
-            if self in state.grid.grid[self.x][self.y]:
-                state.grid.grid[self.x][self.y].remove(self)
+        self.grid.remove_food(self.x, self.y)
 
 
-class BlobImage:
-    def __init__(
-        self, x: float, y: float, radius: float, color: tuple[int, int, int], blob: Any
-    ) -> None:
-        self.x = x
-        self.y = y
-        self.radius = radius
-        self.color = color
-        self.blob = blob
+class BlobColumn:
+    """Blob attribute stored in a column of the grid's ``BlobTable``.
+
+    Once a blob is released from the table its last values are kept on the
+    object, so dead blobs can still be inspected. Writes to a ``tracked``
+    column also keep the table's running total of that column up to date, and
+    energy writes keep its leader.
+    """
+
+    def __init__(self, tracked: bool = False) -> None:
+        self.tracked = tracked
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, blob: Blob, owner: type | None = None) -> int:
+        if blob.slot < 0:
+            return blob.detached[self.name]
+        return int(getattr(blob.grid.blobs, self.name)[blob.slot])
+
+    def __set__(self, blob: Blob, value: int) -> None:
+        if blob.slot < 0:
+            blob.detached[self.name] = value
+            return
+        table = blob.grid.blobs
+        column = getattr(table, self.name)
+        previous = int(column[blob.slot])
+        if self.tracked:
+            table.totals[self.name] += value - previous
+        column[blob.slot] = value
+        if self.name == "energy":
+            table.energy_written(blob.slot, previous)
+
+
+class BlobTable:
+    """Structure-of-arrays storage for per-blob attributes.
+
+    Each live blob owns a slot; freed slots are recycled through a free list and
+    the columns grow by doubling when full. The live slots are also kept
+    densely packed in ``live[:count]`` (removal swaps the last one into the
+    hole), so registering, removing and listing the population are O(1) per
+    blob and a dead blob is simply one whose ``slot`` is -1.
+
+    ``totals`` holds the live sum of every tracked column and
+    ``action_counts`` how many live blobs last took each action, so both can
+    be read without walking the population. ``leader`` is the slot of the
+    live blob with the most energy (the oldest on ties): a blob whose energy
+    rises past it takes its place, and only the leader losing energy or
+    dying marks it ``leader_stale`` for one rescan on the next read.
+    """
+
+    COLUMNS: dict[str, type] = {
+        "x": np.int32,
+        "y": np.int32,
+        "energy": np.int32,
+        "fail": np.int32,
+        "last_hit_turn": np.int64,
+        "birth_turn": np.int64,
+        "last_action": np.int8,
+        "offspring": np.int32,
+    }
+    x: np.ndarray
+    y: np.ndarray
+    energy: np.ndarray
+    fail: np.ndarray
+    last_hit_turn: np.ndarray
+    birth_turn: np.ndarray
+    last_action: np.ndarray
+    offspring: np.ndarray
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.live = np.zeros(capacity, dtype=np.int32)
+        self.live_index = np.full(capacity, -1, dtype=np.int32)
+        self.count = 0
+        self.weights = [
+            np.zeros((capacity, n_in, n_out)) for n_in, n_out in BRAIN_LAYERS
+        ]
+        self.objects: list[Blob | None] = [None] * capacity
+        self.free_slots: list[int] = []
+        self.high_water = 0
+        self.totals: dict[str, int] = {"energy": 0}
+        self.leader = -1
+        self.leader_stale = False
+        self.action_counts = np.zeros(len(ACTION_NAMES), dtype=np.int64)
+
+    def alloc(self, blob: Blob) -> int:
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.high_water == self.capacity:
+                self.grow(self.capacity * 2)
+            slot = self.high_water
+            self.high_water += 1
+        # A recycled slot still holds the previous blob's values
+        for name in self.COLUMNS:
+            getattr(self, name)[slot] = 0
+        self.last_action[slot] = -1
+        self.alive[slot] = True
+        self.live[self.count] = slot
+        self.live_index[slot] = self.count
+        self.count += 1
+        self.objects[slot] = blob
+        self.offer_leader(slot)
+        return slot
+
+    def release(self, blob: Blob) -> None:
+        slot = blob.slot
+        blob.brain.detach()
+        blob.detached = {name: int(getattr(self, name)[slot]) for name in self.COLUMNS}
+        for name in self.totals:
+            self.totals[name] -= blob.detached[name]
+        if blob.detached["last_action"] >= 0:
+            self.action_counts[blob.detached["last_action"]] -= 1
+        blob.slot = -1
+        index = self.live_index[slot]
+        last = self.live[self.count - 1]
+        self.live[index] = last
+        self.live_index[last] = index
+        self.live_index[slot] = -1
+        self.count -= 1
+        if slot == self.leader:
+            self.leader = -1
+            self.leader_stale = True
+        self.alive[slot] = False
+        self.objects[slot] = None
+        self.free_slots.append(slot)
+
+    def live_slots(self) -> np.ndarray:
+        """Slots of the live blobs, as a snapshot safe to iterate while blobs
+        are born and die."""
+        return self.live[: self.count].copy()
+
+    def live_blobs(self) -> list[Blob]:
+        objects = self.objects
+        return [objects[slot] for slot in self.live[: self.count].tolist()]
+
+    def reserve(self, n: int) -> None:
+        """Make room for ``n`` more blobs with at most one reallocation."""
+        needed = self.high_water + n - len(self.free_slots)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.capacity] = column
+            setattr(self, name, grown)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.capacity] = self.alive
+        self.alive = alive
+        live = np.zeros(capacity, dtype=np.int32)
+        live[: self.capacity] = self.live
+        self.live = live
+        live_index = np.full(capacity, -1, dtype=np.int32)
+        live_index[: self.capacity] = self.live_index
+        self.live_index = live_index
+        for i, column in enumerate(self.weights):
+            grown_weights = np.zeros((capacity,) + column.shape[1:])
+            grown_weights[: self.capacity] = column
+            self.weights[i] = grown_weights
+        self.objects.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def clear(self) -> None:
+        for blob in self.objects:
+            if blob is not None:
+                self.release(blob)
+
+    def drain_energy(self, slots: np.ndarray, amount: int) -> None:
+        self.energy[slots] -= amount
+        self.totals["energy"] -= amount * len(slots)
+        # Draining everyone keeps the order; draining some may drop the leader
+        if (
+            not self.leader_stale
+            and len(slots) < self.count
+            and np.any(slots == self.leader)
+        ):
+            self.leader_stale = True
+
+    def energy_written(self, slot: int, previous: int) -> None:
+        if self.leader_stale:
+            return
+        if slot == self.leader:
+            self.leader_stale = int(self.energy[slot]) < previous
+        else:
+            self.offer_leader(slot)
+
+    def offer_leader(self, slot: int) -> None:
+        """Make ``slot`` the leader if it outranks the current one; call it
+        again after changing a live blob's id."""
+        leader = self.leader
+        if self.leader_stale or slot == leader:
+            return
+        if leader >= 0:
+            energy, leader_energy = self.energy[slot], self.energy[leader]
+            if energy < leader_energy:
+                return
+            if energy == leader_energy:
+                blob, current = self.objects[slot], self.objects[leader]
+                assert blob is not None and current is not None
+                if blob.id > current.id:
+                    return
+        self.leader = slot
+
+    def leader_slot(self) -> int:
+        """Slot of the live blob with the most energy, or -1 when empty."""
+        if self.leader_stale:
+            top = self.top_slots("energy", 1)
+            self.leader = int(top[0]) if len(top) else -1
+            self.leader_stale = False
+        return self.leader
+
+    def top_slots(self, column: str, k: int) -> np.ndarray:
+        """Slots of the (up to) ``k`` live blobs with the largest ``column``
+        values, best first; ties go to the oldest blob."""
+        live = np.flatnonzero(self.alive)
+        values = getattr(self, column)[live]
+        if k < len(live):
+            # Keep everything tied with the k-th value so ties resolve by age
+            kth = np.partition(values, len(live) - k)[len(live) - k]
+            keep = values >= kth
+            live, values = live[keep], values[keep]
+        blobs = [self.objects[slot] for slot in live]
+        births = np.array([blob.id if blob else 0 for blob in blobs])
+        order = np.lexsort((births, -values))
+        return live[order[:k]]
+
+    def record_action(self, slot: int, action: int) -> None:
+        previous = self.last_action[slot]
+        if previous >= 0:
+            self.action_counts[previous] -= 1
+        self.action_counts[action] += 1
+        self.last_action[slot] = action
+
+    def predict(self, slots: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+        """Evaluate the brains of ``slots`` on the matching rows of ``inputs``.
+
+        Each layer is a single batched matmul over the stacked weights, i.e.
+        row ``k`` of the result equals ``objects[slots[k]].brain.predict(inputs[k])``.
+        """
+        x = inputs[:, None, :]
+        for column in self.weights:
+            x = np.tanh(np.matmul(x, column[slots]))
+        return x[:, 0, :]
 
 
 class Blob:
     TIMESTEP: float = 0.1
     NEXT_ID: int = 1
 
+    x = BlobColumn()
+    y = BlobColumn()
+    energy = BlobColumn(tracked=True)
+    fail = BlobColumn()
+    last_hit_turn = BlobColumn()
+    birth_turn = BlobColumn()
+    offspring = BlobColumn()
+
     def __init__(
         self,
         x: int,
@@ -103,176 +443,118 @@ class Blob:
         self.id = Blob.NEXT_ID
         Blob.NEXT_ID += 1
         self.parent_ids: tuple[int, int] | tuple[()] = parent_ids or ()
-        self.birth_turn = state.turn
+        self.grid = grid
+        self.sim: Simulation = grid.sim
+        self.detached: dict[str, int] = {}
+        self.slot = grid.blobs.alloc(self)
+        self.birth_turn = self.sim.turn
         self.x = x
         self.y = y
-        self.grid = grid
-        x_real = self.x * state.CELL_SIZE + state.CELL_SIZE / 2
-        y_real = self.y * state.CELL_SIZE + state.CELL_SIZE / 2
-        self.radius = state.CELL_SIZE / 2
-        self.color = (0, min([energy * 5, 255]), max([0, 255 - energy * 5]))
         self.energy = energy
-        self.behaviour: list[str] = []
+        # Lifetime count of each action plus a ring buffer of the latest codes
+        self.action_totals: list[int] = [0] * len(ACTION_NAMES)
+        self.history = np.full(C.BEHAVIOUR_HISTORY, -1, dtype=np.int8)
+        self.actions_taken = 0
         self.fail = 0
-        self.image = BlobImage(
-            color=self.color, x=x_real, y=y_real, radius=self.radius, blob=self
-        )
-        self.mutation_rate = mutation_rate or C.MUTATION_RATE
-        self.brain = brain if brain != 0 else Brain(blob=self)
-        if brain != 0:
-            self.brain.blob = self
-        self.grid.list_blobs.append(self)
-        self.scan_cache: dict[str, Any] = {}
-        self.last_scan_turn = -1
-        self.cache_size_limit = 10
+        self.mutation_rate = mutation_rate or self.sim.params.MUTATION_RATE
+        if brain == 0:
+            brain = Brain(blob=self)
+        else:
+            if brain.blob is not None:
+                # Already driving another blob: give this one its own copy
+                brain = Brain.from_weights(brain.weight)
+            brain.attach(self)
+        self.brain: Brain = brain
+        self.grid.track_birth(self)
         self.recent_actions: deque[int] = deque(maxlen=C.LOOP_REPEAT_THRESHOLD)
-        self.last_hit_turn: int = -C.HIT_COOLDOWN_TURNS
+        self.last_hit_turn = -C.HIT_COOLDOWN_TURNS
         # One penalty per action: 0=eat, 1-4=move, 5=hit, 6=reproduce
         self.action_penalties: list[float] = [0.0] * 7
 
-    def update(self) -> None:
-        self.color = (0, min([self.energy * 5, 255]), max([0, 255 - self.energy * 5]))
-        self.radius = state.CELL_SIZE / 2
-        x_real = self.x * state.CELL_SIZE + state.CELL_SIZE / 2
-        y_real = self.y * state.CELL_SIZE + state.CELL_SIZE / 2
-        self.image.color = self.color
-        self.image.x = x_real
-        self.image.y = y_real
-        self.image.radius = self.radius
-
-    def draw(self, win: pygame.Surface) -> None:
-        x = self.x * state.CELL_SIZE
-        y = self.y * state.CELL_SIZE
-        if self.energy > 0:
-            is_best = False
-            if state.grid is not None and state.grid.better_blob is self:
-                is_best = True
-
-            center_x = x + state.CELL_SIZE / 2
-            center_y = y + state.CELL_SIZE / 2
-
-            if state.image_manager and state.image_manager.blob_image:
-                if is_best:
-                    # Render highlighted: yellow fill and red outline
-                    colored_image = state.image_manager.blob_image.copy()
-                    colored_image.fill(
-                        C.COLOR["YELLOW"], special_flags=pygame.BLEND_MULT
-                    )
-                    win.blit(colored_image, (x, y))
-                    pygame.draw.circle(
-                        win,
-                        C.COLOR["RED"],
-                        (center_x, center_y),
-                        self.radius + 1,
-                        width=2,
-                    )
-                else:
-                    colored_image = state.image_manager.blob_image.copy()
-                    colored_image.fill(self.color, special_flags=pygame.BLEND_MULT)
-                    win.blit(colored_image, (x, y))
-            else:
-                if is_best:
-                    # Highlighted: yellow fill and red outline
-                    pygame.draw.circle(
-                        win, C.COLOR["YELLOW"], (center_x, center_y), self.radius
-                    )
-                    pygame.draw.circle(
-                        win,
-                        C.COLOR["RED"],
-                        (center_x, center_y),
-                        self.radius + 1,
-                        width=2,
-                    )
-                else:
-                    pygame.draw.circle(
-                        win, self.color, (center_x, center_y), self.radius
-                    )
+    def state(self) -> dict[str, Any]:
+        """Everything needed to recreate this live blob with ``from_state``:
+        its ``BlobTable`` columns, the ``BLOB_STATE`` fields and a copy of
+        its brain's weights under ``"weights"``."""
+        table = self.grid.blobs
+        state: dict[str, Any] = {
+            name: getattr(table, name)[self.slot].item() for name in table.COLUMNS
+        }
+        recent = [-1] * C.LOOP_REPEAT_THRESHOLD
+        recent[: len(self.recent_actions)] = self.recent_actions
+        state.update(
+            id=self.id,
+            parents=tuple(self.parent_ids or (0, 0)),
+            mutation_rate=self.mutation_rate,
+            action_totals=list(self.action_totals),
+            history=self.history.copy(),
+            actions_taken=self.actions_taken,
+            recent_actions=recent,
+            action_penalties=list(self.action_penalties),
+            weights=[w.copy() for w in self.brain.weight],
+        )
+        return state
+
+    @classmethod
+    def from_state(
+        cls,
+        grid: Grid,
+        state: dict[str, Any],
+        x: int | None = None,
+        y: int | None = None,
+    ) -> Blob:
+        """Recreate a blob saved by ``state`` on ``grid``, at (x, y) or its
+        saved cell, and place it there.
+
+        Values may be Python or numpy scalars and sequences, e.g. one row of
+        each checkpoint column. The id is restored too, so ``Blob.NEXT_ID``
+        is left to the caller.
+        """
+        parents = [int(p) for p in state["parents"]]
+        blob = cls(
+            int(state["x"]) if x is None else x,
+            int(state["y"]) if y is None else y,
+            int(state["energy"]),
+            grid=grid,
+            brain=Brain.from_weights(list(state["weights"]), copy=False),
+            mutation_rate=float(state["mutation_rate"]),
+            parent_ids=(parents[0], parents[1]) if any(parents) else None,
+        )
+        blob.id = int(state["id"])
+        table = grid.blobs
+        table.offer_leader(blob.slot)
+        # x, y and energy are set above; last_action also counts the action
+        for name in table.COLUMNS:
+            if name not in ("x", "y", "energy", "last_action"):
+                getattr(table, name)[blob.slot] = state[name]
+        if state["last_action"] >= 0:
+            table.record_action(blob.slot, int(state["last_action"]))
+        blob.action_totals = [int(v) for v in state["action_totals"]]
+        blob.history = np.array(state["history"], dtype=np.int8)
+        blob.actions_taken = int(state["actions_taken"])
+        blob.recent_actions.extend(int(a) for a in state["recent_actions"] if a >= 0)
+        blob.action_penalties = [float(p) for p in state["action_penalties"]]
+        grid.place_blob(blob)
+        return blob
 
     def scan_near_creatures(self) -> list[tuple[Any, int]]:
-        cache_key = f"creatures_{self.x}_{self.y}"
-        if cache_key in self.scan_cache and self.last_scan_turn == state.turn:
-            cached = cast(list[tuple[Any, int]], self.scan_cache[cache_key])
-            return cached
-        near_list: list[tuple[Any, int]] = []
-        for i in range(-state.SCAN_RANGE, state.SCAN_RANGE + 1):
-            for j in range(-state.SCAN_RANGE, state.SCAN_RANGE + 1):
-                if abs(i) + abs(j) <= state.SCAN_RANGE:
-                    x_check = self.x + i
-                    y_check = self.y + j
-                    if not (
-                        0 <= x_check < state.TAILLE_GRID
-                        and 0 <= y_check < state.TAILLE_GRID
-                    ):
-                        continue
-                    c = self.grid.grid[x_check][y_check]
-                    if c and isinstance(c[0], Blob):
-                        dist = abs(i) + abs(j)
-                        near_list.append((c[0], dist))
-        near_list.sort(key=lambda x: x[1])
-        if len(self.scan_cache) >= self.cache_size_limit:
-            oldest_key = next(iter(self.scan_cache))
-            del self.scan_cache[oldest_key]
-        self.scan_cache[cache_key] = list(near_list)
-        self.last_scan_turn = state.turn
-        return list(near_list)
+        return self.grid.blobs_within(self.x, self.y, self.sim.params.SCAN_RANGE)
 
     def scan_near_food(self) -> list[tuple[Food, int]]:
-        cache_key = f"food_{self.x}_{self.y}"
-        if cache_key in self.scan_cache and self.last_scan_turn == state.turn:
-            cached = cast(list[tuple[Food, int]], self.scan_cache[cache_key])
-            return cached
-        near_list: list[tuple[Food, int]] = []
-        for i in range(-state.SCAN_RANGE, state.SCAN_RANGE + 1):
-            for j in range(-state.SCAN_RANGE, state.SCAN_RANGE + 1):
-                if abs(i) + abs(j) <= state.SCAN_RANGE:
-                    x_check = self.x + i
-                    y_check = self.y + j
-                    if not (
-                        0 <= x_check < state.TAILLE_GRID
-                        and 0 <= y_check < state.TAILLE_GRID
-                    ):
-                        continue
-                    c = self.grid.grid[x_check][y_check]
-                    if c and isinstance(c[0], Food):
-                        dist = abs(i) + abs(j)
-                        near_list.append((c[0], dist))
-        near_list.sort(key=lambda x: x[1])
-        if len(self.scan_cache) >= self.cache_size_limit:
-            oldest_key = next(iter(self.scan_cache))
-            del self.scan_cache[oldest_key]
-        self.scan_cache[cache_key] = list(near_list)
-        self.last_scan_turn = state.turn
-        return list(near_list)
+        return self.grid.food_within(self.x, self.y, self.sim.params.SCAN_RANGE)
 
     def scan_food_density(self) -> list[float]:
-        d_NE = calculate_type_density(
-            self.grid.grid, self.x, self.y, "NE", C.DENSITY_SCAN_RANGE, Food
-        )
-        d_NW = calculate_type_density(
-            self.grid.grid, self.x, self.y, "NW", C.DENSITY_SCAN_RANGE, Food
-        )
-        d_SE = calculate_type_density(
-            self.grid.grid, self.x, self.y, "SE", C.DENSITY_SCAN_RANGE, Food
-        )
-        d_SW = calculate_type_density(
-            self.grid.grid, self.x, self.y, "SW", C.DENSITY_SCAN_RANGE, Food
-        )
-        return [max(0.0, min(1.0, v)) for v in [d_NE, d_NW, d_SE, d_SW]]
+        _, food_sat = self.grid.density_tables()
+        return self._quadrant_densities(food_sat)
 
     def scan_blob_density(self) -> list[float]:
-        d_NE = calculate_type_density(
-            self.grid.grid, self.x, self.y, "NE", C.DENSITY_SCAN_RANGE, Blob
-        )
-        d_NW = calculate_type_density(
-            self.grid.grid, self.x, self.y, "NW", C.DENSITY_SCAN_RANGE, Blob
-        )
-        d_SE = calculate_type_density(
-            self.grid.grid, self.x, self.y, "SE", C.DENSITY_SCAN_RANGE, Blob
-        )
-        d_SW = calculate_type_density(
-            self.grid.grid, self.x, self.y, "SW", C.DENSITY_SCAN_RANGE, Blob
-        )
-        return [max(0.0, min(1.0, v)) for v in [d_NE, d_NW, d_SE, d_SW]]
+        blob_sat, _ = self.grid.density_tables()
+        return self._quadrant_densities(blob_sat)
+
+    def _quadrant_densities(self, sat: np.ndarray) -> list[float]:
+        densities = quadrant_densities(
+            sat, np.array([self.x]), np.array([self.y]), C.DENSITY_SCAN_RANGE
+        )[0]
+        return [max(0.0, min(1.0, float(v))) for v in densities]
 
     def moove(self, direction: int) -> int:
         new_x, new_y = self.x, self.y
@@ -287,29 +569,24 @@ class Blob:
         else:
             self.fail += 1
             return 1
-        assert state.grid is not None
         # Check borders (no wrapping)
-        if not (0 <= new_x < state.TAILLE_GRID and 0 <= new_y < state.TAILLE_GRID):
+        size_x, size_y = self.grid.shape
+        if not (0 <= new_x < size_x and 0 <= new_y < size_y):
             return 1
-        target_cell = state.grid.grid[new_x][new_y]
-        has_blob = any(isinstance(entity, Blob) for entity in target_cell)
-        if not has_blob:
-            if self in state.grid.grid[self.x][self.y]:
-                state.grid.grid[self.x][self.y].remove(self)
-            self.x = new_x
-            self.y = new_y
-            state.grid.grid[self.x][self.y].append(self)
+        if self.grid.occupancy[new_x, new_y] < 0:
+            self.grid.move_blob(self, new_x, new_y)
             self.fail = 0
             return 0
         self.fail += 1
         return 1
 
     def hit_closer(self) -> int:
-        if state.turn - self.last_hit_turn < C.HIT_COOLDOWN_TURNS:
+        if self.sim.turn - self.last_hit_turn < C.HIT_COOLDOWN_TURNS:
             return 1
-        near_blob = self.scan_near_creatures()
-        if near_blob and near_blob[0][1] <= C.HIT_RANGE:
-            target = near_blob[0][0]
+        hit_range = min(C.HIT_RANGE, self.sim.params.SCAN_RANGE)
+        nearest = self.grid.nearest_blob(self.x, self.y, hit_range)
+        if nearest is not None:
+            target = nearest[0]
             is_kin = hasattr(target, "id") and (
                 (self.id in getattr(target, "parent_ids", ()))
                 or (target.id in getattr(self, "parent_ids", ()))
@@ -322,17 +599,17 @@ class Blob:
             self.energy -= C.ATTACK_COST
             if target.energy <= 0:
                 target.suicide()
-            self.last_hit_turn = state.turn
+            self.last_hit_turn = self.sim.turn
             return 0
         return 1
 
     def eat_closer(self) -> int:
-        near_food = self.scan_near_food()
-        if near_food and near_food[0][1] <= C.EAT_RANGE:
-            food_obj = near_food[0][0]
+        eat_range = min(C.EAT_RANGE, self.sim.params.SCAN_RANGE)
+        nearest = self.grid.nearest_food(self.x, self.y, eat_range)
+        if nearest is not None:
+            food_obj = nearest[0]
             self.energy += food_obj.amount
             food_obj.suicide()
-            self.scan_cache.clear()
             return 0
         return 1
 
@@ -344,45 +621,37 @@ class Blob:
         # Attempt reproduction if there is at least one blob in contact (distance 0)
         if self.energy < 30:
             return 1
-        near_blob = self.scan_near_creatures()
-        contacts = [
-            b
-            for (b, d) in near_blob
-            if d == 0 and isinstance(b, Blob) and b.energy >= 30
-        ]
-        if not contacts:
+        # Only the blob standing on this very cell is in contact (distance 0)
+        nearest = self.grid.nearest_blob(self.x, self.y, 0)
+        if nearest is None or nearest[0].energy < 30:
             return 1
-        partner: Blob = rd.choice(contacts)
+        partner: Blob = nearest[0]
+        rng = self.sim.rng
         # Create a child brain by averaging weights and applying occasional mutation
-        new_brain = Brain(blob=None)
-        for i in range(len(self.brain.weight)):
-            new_brain.weight[i] = (self.brain.weight[i] + partner.brain.weight[i]) / 2
-            if rd.random() < self.mutation_rate:
-                new_brain.weight[i] += np.random.normal(
-                    0, C.MUTATION_POWER, new_brain.weight[i].shape
-                )
-        # Spawn child at Manhattan distance 1 or 2 around parent
-        assert state.grid is not None
-        # Allow spawn up to Manhattan distance 4 (1..4)
-        candidate_offsets: list[tuple[int, int]] = []
-        for d in [1, 2, 3, 4]:
-            candidate_offsets.extend([(d, 0), (-d, 0), (0, d), (0, -d)])
-        rd.shuffle(candidate_offsets)
-        for dx, dy in candidate_offsets:
+        mutated = rng.random(len(BRAIN_LAYERS)) < self.mutation_rate
+        weights = []
+        for i, (mine, theirs) in enumerate(
+            zip(self.brain.weight, partner.brain.weight)
+        ):
+            weight = (mine + theirs) / 2
+            if mutated[i]:
+                weight += rng.normal(0, C.MUTATION_POWER, weight.shape)
+            weights.append(weight)
+        new_brain = Brain.from_weights(weights, copy=False)
+        # Spawn child up to Manhattan distance REPRODUCE_DISTANCE, on the
+        # first free cell in a random order
+        params = self.sim.params
+        size_x, size_y = self.grid.shape
+        order = rng.permutation(len(SPAWN_OFFSETS))
+        for dx, dy in SPAWN_OFFSETS[order].tolist():
             rx = self.x + dx
             ry = self.y + dy
-            if not (0 <= rx < state.TAILLE_GRID and 0 <= ry < state.TAILLE_GRID):
+            if not (0 <= rx < size_x and 0 <= ry < size_y):
                 continue
-            cell_entities = state.grid.grid[rx][ry]
-            has_blob = any(isinstance(e, Blob) for e in cell_entities)
-            if not has_blob:
-                # Remove any food in the target cell
-                state.grid.grid[rx][ry] = [
-                    e for e in cell_entities if not isinstance(e, Food)
-                ]
+            if self.grid.occupancy[rx, ry] < 0:
                 # Energy for child: 20 + 10% of parents average, capped by MAX_SPAWN_ENERGY
                 avg_parents = (self.energy + partner.energy) / 2.0
-                spawn_energy = int(min(C.MAX_SPAWN_ENERGY, 20 + 0.1 * avg_parents))
+                spawn_energy = int(min(params.MAX_SPAWN_ENERGY, 20 + 0.1 * avg_parents))
                 child = Blob(
                     rx,
                     ry,
@@ -395,65 +664,79 @@ class Blob:
                 # Energy cost to parents
                 self.energy -= 20
                 partner.energy -= 20
+                self.offspring += 1
+                if partner is not self:
+                    partner.offspring += 1
                 self.grid.instantiate(child)
-                self.grid.clear_cache()
                 return 0
         return 1
 
     def main(self) -> None:
         self.energy -= C.ENERGY_DECAY_PER_TURN
-        if state.image_manager:
-            state.image_manager.rescale(state.CELL_SIZE)
-        near_food = self.scan_near_food()
-        near_blob = self.scan_near_creatures()
-
-        def norm(val: float, scale: float) -> float:
-            if scale == 0:
-                return 0.0
-            v = val / scale
-            if v > 1:
-                return 1.0
-            if v < -1:
-                return -1.0
-            return v
-
-        if near_food == []:
+        self.act(self.brain.predict(np.array(self.perceive())))
+
+    def perceive(self) -> list[float]:
+        """Build the 17 inputs of the brain from the blob's surroundings."""
+        senses = self.sense_neighbours()
+        return (
+            senses[:7]
+            + self.scan_blob_density()
+            + self.scan_food_density()
+            + senses[7:]
+        )
+
+    def sense_neighbours(self) -> list[float]:
+        """The 9 brain inputs coming from the nearest food and blobs: food
+        vector (3), blob vector (4), contact count and energy (2)."""
+        scan_range = self.sim.params.SCAN_RANGE
+        nearest_food = self.grid.nearest_food(self.x, self.y, scan_range)
+        nearest_blob = self.grid.nearest_blob(self.x, self.y, scan_range)
+        scan_scale = max(1, scan_range)
+        if nearest_food is None:
             closer_food_vector = [0.0, 0.0, 0.0]
         else:
-            closer_food = near_food[0]
+            closer_food = nearest_food[0]
             closer_food_vector = [
-                norm(dist_x(self, closer_food[0]), max(1, state.SCAN_RANGE)),
-                norm(dist_y(self, closer_food[0]), max(1, state.SCAN_RANGE)),
-                norm(closer_food[0].amount, 10.0),
+                norm(dist_x(self, closer_food), scan_scale),
+                norm(dist_y(self, closer_food), scan_scale),
+                norm(closer_food.amount, 10.0),
             ]
-        if near_blob == []:
+        if nearest_blob is None:
             closer_blob_vector = [0.0, 0.0, 0.0, norm(self.fail, 10.0)]
             contact_count = 0.0
             contact_avg_energy = 0.0
         else:
-            closer_blob = near_blob[0]
+            closer_blob, closer_dist = nearest_blob
             closer_blob_vector = [
-                norm(dist_x(self, closer_blob[0]), max(1, state.SCAN_RANGE)),
-                norm(dist_y(self, closer_blob[0]), max(1, state.SCAN_RANGE)),
-                norm(closer_blob[0].energy, 100.0),
+                norm(dist_x(self, closer_blob), scan_scale),
+                norm(dist_y(self, closer_blob), scan_scale),
+                norm(closer_blob.energy, 100.0),
                 norm(self.fail, 10.0),
             ]
-            # Compute number of contacting blobs and their average energy
-            contacts = [b for (b, d) in near_blob if d == 0]
+            # Compute number of contacting blobs and their average energy;
+            # one blob per cell, so only a nearest blob at distance 0 counts
+            contacts = [closer_blob] if closer_dist == 0 else []
             contact_count = float(len(contacts))
             contact_avg_energy = (
                 (sum(b.energy for b in contacts) / contact_count)
                 if contact_count > 0
                 else 0.0
             )
-        entree = (
+        return (
             closer_food_vector
             + closer_blob_vector
-            + self.scan_blob_density()
-            + self.scan_food_density()
             + [norm(contact_count, 4.0), norm(contact_avg_energy, 100.0)]
         )
-        result = list(self.brain.predict(np.array(entree)))
+
+    def act(self, output: np.ndarray, noise: np.ndarray | None = None) -> None:
+        """Pick an action from the brain output and carry it out.
+
+        ``noise`` holds one exploration draw per action, so a whole turn can
+        draw them in one call; it is drawn here when not given.
+        """
+        if noise is None:
+            noise = self.sim.rng.uniform(-C.ACTION_NOISE, C.ACTION_NOISE, len(output))
+        result = list(output)
         self.action_penalties = [
             p * C.ACTION_PENALTY_DECAY for p in self.action_penalties
         ]
@@ -471,10 +754,9 @@ class Blob:
             C.SOFTMAX_TEMPERATURE_MAX - C.SOFTMAX_TEMPERATURE_MIN
         )
         prefs = [
-            (r - self.action_penalties[i]) / max(0.01, temperature)
-            for i, r in enumerate(result)
+            (r - self.action_penalties[i]) / max(0.01, temperature) + n
+            for i, (r, n) in enumerate(zip(result, noise.tolist()))
         ]
-        prefs = [p + rd.uniform(-0.05, 0.05) for p in prefs]
         choice = prefs.index(max(prefs))
         self.consigne_behaviour(choice)
         if choice in [1, 2, 3, 4]:
@@ -496,144 +778,440 @@ class Blob:
             self.suicide()
 
     def consigne_behaviour(self, choice: int) -> None:
-        if choice in [1, 2, 3, 4]:
-            if choice == 1:
-                self.behaviour.append("bas")
-            if choice == 2:
-                self.behaviour.append("haut")
-            if choice == 3:
-                self.behaviour.append("droite")
-            if choice == 4:
-                self.behaviour.append("gauche")
-        if choice == 0:
-            self.behaviour.append("manger")
-        if choice == 5:
-            self.behaviour.append("taper")
-        if choice == 6:
-            self.behaviour.append("reproduire")
+        self.history[self.actions_taken % len(self.history)] = choice
+        self.actions_taken += 1
+        self.action_totals[choice] += 1
+        self.grid.blobs.record_action(self.slot, choice)
+
+    @property
+    def age(self) -> int:
+        return self.sim.turn - self.birth_turn
+
+    @property
+    def last_behaviour(self) -> str:
+        if not self.actions_taken:
+            return "none"
+        last = self.history[(self.actions_taken - 1) % len(self.history)]
+        return ACTION_NAMES[int(last)]
+
+    def recent_behaviour(self) -> list[str]:
+        """Names of the last ``BEHAVIOUR_HISTORY`` actions, oldest first."""
+        size = len(self.history)
+        start = self.actions_taken % size if self.actions_taken > size else 0
+        codes = np.roll(self.history, -start)[: min(self.actions_taken, size)]
+        return [ACTION_NAMES[code] for code in codes.tolist()]
 
     def behaviour_percentages(self) -> dict[str, float]:
-        total_actions = len(self.behaviour)
-        counters: dict[str, float] = {
-            k: 0.0
-            for k in [
-                "manger",
-                "taper",
-                "bas",
-                "haut",
-                "droite",
-                "gauche",
-                "reproduire",
-            ]
+        if self.actions_taken == 0:
+            return dict.fromkeys(ACTION_NAMES, 0.0)
+        return {
+            name: count * 100.0 / self.actions_taken
+            for name, count in zip(ACTION_NAMES, self.action_totals)
         }
-        if total_actions == 0:
-            return counters
-        for action in self.behaviour:
-            if action in counters:
-                counters[action] += 1.0
-        return {k: (v * 100.0) / float(total_actions) for k, v in counters.items()}
 
     def suicide(self) -> None:
-        assert state.grid is not None
-        if self in state.grid.grid[self.x][self.y]:
-            state.grid.grid[self.x][self.y].remove(self)
-        if self in self.grid.list_blobs:
-            self.grid.list_blobs.remove(self)
-        self.scan_cache.clear()
+        if self.slot >= 0:
+            self.grid.remove_blob(self)
 
 
 class Grid:
-    def __init__(self, list_blobs: list[Any] | None = None) -> None:
-        list_blobs = list_blobs or []
-        self.list_blobs: list[Any] = list_blobs
+    """Array-backed world.
+
+    ``food`` holds the food amount of every cell (0 when empty) and
+    ``occupancy`` the ``BlobTable`` slot of the blob standing on it (-1 when
+    empty). A cell may hold both food and a blob; the food then hides the blob
+    from other blobs' scans and from the renderer.
+
+    The grid is ``TAILLE_GRID`` cells square unless another ``shape`` is
+    given. New food and blobs only ever appear inside ``region``, given as
+    ``(x0, y0, x1, y1)``, which is the whole grid unless the caller narrows
+    it (see ``tiles``).
+    """
+
+    # Most (orphan, food) pairs compared in one go when the food field is
+    # repaired after a removal
+    FIELD_RESCAN_CELLS: int = 1 << 15
+
+    def __init__(
+        self,
+        sim: Simulation,
+        populate: bool = True,
+        seed_brains: list[Brain] | None = None,
+        shape: tuple[int, int] | None = None,
+    ) -> None:
+        self.sim = sim
+        # Genomes the initial population is cloned from instead of random ones
+        self.seed_brains: list[Brain] = seed_brains or []
         self.oldest_blob: Any = 0
         self.better_blob: Any = 0
-        self.grid: list[list[list[Any]]] = [
-            [[] for _ in range(state.TAILLE_GRID)] for _ in range(state.TAILLE_GRID)
-        ]
-        self.scan_cache: dict[str, Any] = {}
-        self.cache_turn = -1
-        for i in range(state.TAILLE_GRID):
-            for j in range(state.TAILLE_GRID):
-                rd_spawn = rd.random()
-                rd_type = rd.random()
-                if rd_spawn <= state.SPAWN_RATE:
-                    if rd_type <= state.FOOD_RATE:
-                        self.grid[i][j].append(Food(i, j, rd.randint(1, 8)))
-                    else:
-                        # Only place blob if cell empty of blobs
-                        if not any(isinstance(e, Blob) for e in self.grid[i][j]):
-                            self.grid[i][j].append(
-                                Blob(i, j, C.MAX_SPAWN_ENERGY, grid=self)
-                            )
+        # Every blob in creation order; dead ones are dropped lazily
+        self.birth_order: deque[Blob] = deque()
+        size = self.params.TAILLE_GRID
+        self.shape: tuple[int, int] = shape or (size, size)
+        self.region: tuple[int, int, int, int] = (0, 0, *self.shape)
+        self.food = np.zeros(self.shape, dtype=np.int16)
+        self.occupancy = np.full(self.shape, -1, dtype=np.int32)
+        self.blobs = BlobTable()
+        self.density_sats: tuple[np.ndarray, np.ndarray] | None = None
+        self.density_turn = -1
+        self.use_food_field = C.FOOD_FIELD
+        self.food_field: tuple[np.ndarray, np.ndarray] | None = None
+        self.food_field_radius = -1
+        self.food_count = 0
+        self.food_energy = 0
+        if populate:
+            self.populate()
 
-    def instantiate(self, entity: Any) -> None:
-        existing_food = [
-            e for e in self.grid[entity.x][entity.y] if isinstance(e, Food)
+    @property
+    def params(self) -> SimulationParams:
+        return self.sim.params
+
+    @property
+    def rng(self) -> np.random.Generator:
+        return self.sim.rng
+
+    def scan_offsets(
+        self, x: int, y: int, radius: int, target: str, first_only: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cells around (x, y) within ``radius`` holding ``target`` ("food" or
+        "blob"), nearest first.
+
+        Walks the shared distance-sorted offset table chunk by chunk; with
+        ``first_only`` it stops at the first chunk containing a match.
+        """
+        offsets = diamond_offsets(radius)
+        size_x, size_y = self.shape
+        border = (
+            x - radius < 0
+            or y - radius < 0
+            or x + radius >= size_x
+            or y + radius >= size_y
+        )
+        found: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        for start, end in offsets.stages:
+            px = offsets.dx[start:end] + x
+            py = offsets.dy[start:end] + y
+            dist = offsets.dist[start:end]
+            if border:
+                inside = (px >= 0) & (px < size_x) & (py >= 0) & (py < size_y)
+                px, py, dist = px[inside], py[inside], dist[inside]
+            food = self.food[px, py]
+            if target == "food":
+                hit = food > 0
+            else:
+                # Food lying on a cell hides the blob standing on it
+                hit = (self.occupancy[px, py] >= 0) & (food == 0)
+            idx = np.flatnonzero(hit)
+            if idx.size:
+                if first_only:
+                    idx = idx[:1]
+                    return px[idx], py[idx], dist[idx]
+                found.append((px[idx], py[idx], dist[idx]))
+        if not found:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty, empty
+        xs, ys, dists = zip(*found)
+        return np.concatenate(xs), np.concatenate(ys), np.concatenate(dists)
+
+    def nearest_food(self, x: int, y: int, radius: int) -> tuple[Food, int] | None:
+        if self.use_food_field and radius <= self.params.SCAN_RANGE:
+            dist, source = self.nearest_food_field()
+            d = int(dist[x, y])
+            if d > radius:
+                return None
+            fx, fy = divmod(int(source[x, y]), self.food.shape[1])
+            return Food(fx, fy, int(self.food[fx, fy]), self), d
+        xs, ys, dists = self.scan_offsets(x, y, radius, "food", first_only=True)
+        if not dists.size:
+            return None
+        fx, fy = int(xs[0]), int(ys[0])
+        return Food(fx, fy, int(self.food[fx, fy]), self), int(dists[0])
+
+    def nearest_blob(self, x: int, y: int, radius: int) -> tuple[Blob, int] | None:
+        xs, ys, dists = self.scan_offsets(x, y, radius, "blob", first_only=True)
+        if not dists.size:
+            return None
+        blob = self.blobs.objects[self.occupancy[xs[0], ys[0]]]
+        assert blob is not None
+        return blob, int(dists[0])
+
+    def food_within(self, x: int, y: int, radius: int) -> list[tuple[Food, int]]:
+        xs, ys, dists = self.scan_offsets(x, y, radius, "food", first_only=False)
+        amounts = self.food[xs, ys]
+        return [
+            (Food(int(fx), int(fy), int(a), self), int(d))
+            for fx, fy, a, d in zip(xs, ys, amounts, dists)
         ]
-        if existing_food:
-            self.grid[entity.x][entity.y] = [
-                e for e in self.grid[entity.x][entity.y] if not isinstance(e, Food)
+
+    def blobs_within(self, x: int, y: int, radius: int) -> list[tuple[Any, int]]:
+        xs, ys, dists = self.scan_offsets(x, y, radius, "blob", first_only=False)
+        objects = self.blobs.objects
+        slots = self.occupancy[xs, ys]
+        return [(objects[slot], int(d)) for slot, d in zip(slots, dists)]
+
+    def nearest_food_field(self) -> tuple[np.ndarray, np.ndarray]:
+        """Distance to and flat index of the nearest food of every cell."""
+        radius = self.params.SCAN_RANGE
+        if self.food_field is None or self.food_field_radius != radius:
+            self.food_field = nearest_source_transform(self.food > 0, radius)
+            self.food_field_radius = radius
+        return self.food_field
+
+    def _diamond_around(
+        self, x: int, y: int, radius: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        offsets = diamond_offsets(radius)
+        px, py = offsets.dx + x, offsets.dy + y
+        size_x, size_y = self.food.shape
+        inside = (px >= 0) & (px < size_x) & (py >= 0) & (py < size_y)
+        return px[inside], py[inside], offsets.dist[inside]
+
+    def _food_field_added(self, x: int, y: int) -> None:
+        if self.food_field is None:
+            return
+        dist, source = self.food_field
+        px, py, d = self._diamond_around(x, y, self.food_field_radius)
+        index = x * self.food.shape[1] + y
+        current_d, current_s = dist[px, py], source[px, py]
+        better = (d < current_d) | ((d == current_d) & (index < current_s))
+        dist[px[better], py[better]] = d[better]
+        source[px[better], py[better]] = index
+
+    def _food_field_removed(self, x: int, y: int) -> None:
+        if self.food_field is None:
+            return
+        dist, source = self.food_field
+        radius = self.food_field_radius
+        size_x, size_y = self.food.shape
+        px, py, _ = self._diamond_around(x, y, radius)
+        orphans = source[px, py] == x * size_y + y
+        ox, oy = px[orphans], py[orphans]
+        if not ox.size:
+            return
+        # The new nearest food of a cell within ``radius`` of this one lies
+        # within ``2 * radius`` of it, so only that food is compared with the
+        # orphans, FIELD_RESCAN_CELLS pairs at a time. Candidates come in
+        # flat index order, so ``argmin`` keeps the same tie-breaks as a scan
+        x0, x1 = max(x - 2 * radius, 0), min(x + 2 * radius + 1, size_x)
+        y0, y1 = max(y - 2 * radius, 0), min(y + 2 * radius + 1, size_y)
+        fx, fy = np.nonzero(self.food[x0:x1, y0:y1])
+        fx += x0
+        fy += y0
+        new_dist = np.full(len(ox), radius + 1, dtype=dist.dtype)
+        new_source = np.full(len(ox), -1, dtype=source.dtype)
+        chunk = max(1, self.FIELD_RESCAN_CELLS // max(len(fx), 1))
+        for start in range(0, len(ox) if len(fx) else 0, chunk):
+            end = start + chunk
+            d = np.abs(ox[start:end, None] - fx) + np.abs(oy[start:end, None] - fy)
+            best = d.argmin(axis=1)
+            best_d = d[np.arange(len(best)), best]
+            near = best_d <= radius
+            new_dist[start:end] = np.where(near, best_d, radius + 1)
+            new_source[start:end] = np.where(near, fx[best] * size_y + fy[best], -1)
+        dist[ox, oy] = new_dist
+        source[ox, oy] = new_source
+
+    def density_tables(self) -> tuple[np.ndarray, np.ndarray]:
+        """Summed-area tables of visible blobs and of food, built once per turn."""
+        if self.density_sats is None or self.density_turn != self.sim.turn:
+            has_food = self.food > 0
+            visible_blobs = (self.occupancy >= 0) & ~has_food
+            self.density_sats = (
+                summed_area_table(visible_blobs),
+                summed_area_table(has_food),
+            )
+            self.density_turn = self.sim.turn
+        return self.density_sats
+
+    def density_features(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Blob then food NE/NW/SE/SW densities around every (x, y), shape (N, 8)."""
+        blob_sat, food_sat = self.density_tables()
+        r = C.DENSITY_SCAN_RANGE
+        return np.hstack(
+            [
+                quadrant_densities(blob_sat, xs, ys, r),
+                quadrant_densities(food_sat, xs, ys, r),
             ]
-            self.grid[entity.x][entity.y].append(entity)
-        else:
-            self.grid[entity.x][entity.y] = [entity]
+        )
+
+    def perceive(self, blobs: list[Blob]) -> np.ndarray:
+        """Brain inputs of all ``blobs`` as one (N, 17) matrix."""
+        slots = np.array([blob.slot for blob in blobs])
+        senses = np.array([blob.sense_neighbours() for blob in blobs])
+        densities = self.density_features(self.blobs.x[slots], self.blobs.y[slots])
+        return np.hstack([senses[:, :7], densities, senses[:, 7:]])
+
+    def blob_at(self, x: int, y: int) -> Blob | None:
+        slot = self.occupancy[x, y]
+        return self.blobs.objects[slot] if slot >= 0 else None
+
+    def food_at(self, x: int, y: int) -> Food | None:
+        amount = int(self.food[x, y])
+        return Food(x, y, amount, self) if amount > 0 else None
+
+    def iter_food(self) -> list[Food]:
+        xs, ys = np.nonzero(self.food)
+        return [
+            Food(int(x), int(y), int(self.food[x, y]), self) for x, y in zip(xs, ys)
+        ]
+
+    @property
+    def population(self) -> int:
+        return self.blobs.count
+
+    @property
+    def list_blobs(self) -> list[Blob]:
+        """Live blobs in registry order (a fresh list on every access)."""
+        return self.blobs.live_blobs()
+
+    def place_food(self, x: int, y: int, amount: int) -> None:
+        self.remove_food(x, y)
+        self.food[x, y] = amount
+        self.food_count += 1
+        self.food_energy += amount
+        self._food_field_added(x, y)
+
+    def remove_food(self, x: int, y: int) -> None:
+        amount = int(self.food[x, y])
+        if amount == 0:
+            return
+        self.food[x, y] = 0
+        self.food_count -= 1
+        self.food_energy -= amount
+        self._food_field_removed(x, y)
+
+    def place_blob(self, blob: Blob) -> None:
+        self.occupancy[blob.x, blob.y] = blob.slot
+
+    def move_blob(self, blob: Blob, x: int, y: int) -> None:
+        if self.occupancy[blob.x, blob.y] == blob.slot:
+            self.occupancy[blob.x, blob.y] = -1
+        blob.x = x
+        blob.y = y
+        self.occupancy[x, y] = blob.slot
+
+    def remove_blob(self, blob: Blob) -> None:
+        if self.occupancy[blob.x, blob.y] == blob.slot:
+            self.occupancy[blob.x, blob.y] = -1
+        self.blobs.release(blob)
+
+    def instantiate(self, entity: Any) -> None:
+        self.remove_food(entity.x, entity.y)
+        self.place_blob(entity)
+
+    def sample_region(self, rate: float) -> tuple[np.ndarray, np.ndarray]:
+        """Cells of ``region`` each picked with probability ``rate``."""
+        x0, y0, x1, y1 = self.region
+        xs, ys = sample_cells((x1 - x0, y1 - y0), rate, self.rng)
+        return xs + x0, ys + y0
 
     def reset_food(self) -> None:
-        for i in range(state.TAILLE_GRID):
-            for j in range(state.TAILLE_GRID):
-                rd_spawn = rd.random()
-                if rd_spawn <= state.RESET_FOOD_RATE:
-                    has_food = any(
-                        isinstance(entity, Food) for entity in self.grid[i][j]
-                    )
-                    has_blob = any(
-                        isinstance(entity, Blob) for entity in self.grid[i][j]
-                    )
-                    if not has_food and not has_blob:
-                        self.grid[i][j].append(Food(i, j, rd.randint(1, 8)))
+        xs, ys = self.sample_region(self.params.RESET_FOOD_RATE)
+        empty = (self.food[xs, ys] == 0) & (self.occupancy[xs, ys] < 0)
+        xs, ys = xs[empty].tolist(), ys[empty].tolist()
+        amounts = self.rng.integers(1, 9, len(xs)).tolist()
+        for i, j, amount in zip(xs, ys, amounts):
+            self.place_food(i, j, amount)
 
     def reset_spawn(self, brain: Any) -> None:
-        for i in range(state.TAILLE_GRID):
-            for j in range(state.TAILLE_GRID):
-                rd_spawn = rd.random()
-                if rd_spawn <= state.RESET_SPAWN_RATE:
-                    if not any(isinstance(e, Blob) for e in self.grid[i][j]):
-                        self.grid[i][j].append(
-                            Blob(i, j, C.MAX_SPAWN_ENERGY, grid=self, brain=brain)
-                        )
+        """Spawn blobs on empty sampled cells with ``brain``: one brain, a
+        list of them (e.g. ``GenomeArchive.brains()``) or 0 for random ones."""
+        xs, ys = self.sample_region(self.params.RESET_SPAWN_RATE)
+        empty = self.occupancy[xs, ys] < 0
+        self.spawn_blobs(xs[empty], ys[empty], self.params.MAX_SPAWN_ENERGY, brain)
 
     def reset_map(self) -> None:
-        self.list_blobs = []
-        self.grid = [
-            [[] for _ in range(state.TAILLE_GRID)] for _ in range(state.TAILLE_GRID)
-        ]
-        for i in range(state.TAILLE_GRID):
-            for j in range(state.TAILLE_GRID):
-                rd_spawn = rd.random()
-                rd_type = rd.random()
-                if rd_spawn <= state.SPAWN_RATE:
-                    if rd_type <= state.FOOD_RATE:
-                        self.grid[i][j].append(Food(i, j, rd.randint(1, 8)))
-                    else:
-                        if not any(isinstance(e, Blob) for e in self.grid[i][j]):
-                            self.grid[i][j].append(
-                                Blob(i, j, C.MAX_SPAWN_ENERGY, grid=self)
-                            )
+        self.density_sats = None
+        self.food_field = None
+        self.food_count = 0
+        self.food_energy = 0
+        self.blobs.clear()
+        self.birth_order.clear()
+        self.food = np.zeros(self.shape, dtype=np.int16)
+        self.occupancy = np.full(self.shape, -1, dtype=np.int32)
+        self.populate()
 
-    def update_data(self) -> None:
-        if self.list_blobs:
-            self.oldest_blob = max(self.list_blobs, key=lambda x: len(x.behaviour))
-            self.better_blob = max(self.list_blobs, key=lambda x: x.energy)
-            self.all_latest_behaviours = [
-                blob.behaviour[-1] if blob.behaviour else "none"
-                for blob in self.list_blobs
+    def populate(self) -> None:
+        """Scatter the initial food and blobs over the empty ``region``.
+
+        Each cell spawns something with probability ``SPAWN_RATE``; that is
+        food (1 to 8) with probability ``FOOD_RATE`` and a fresh blob otherwise.
+        """
+        x0, y0, x1, y1 = self.region
+        shape = (x1 - x0, y1 - y0)
+        spawned = self.rng.random(shape) <= self.params.SPAWN_RATE
+        is_food = self.rng.random(shape) <= self.params.FOOD_RATE
+        food_cells = spawned & is_food
+        amounts = self.rng.integers(1, 9, int(food_cells.sum()))
+        self.food[x0:x1, y0:y1][food_cells] = amounts
+        self.food_count += len(amounts)
+        self.food_energy += int(amounts.sum())
+        xs, ys = np.nonzero(spawned & ~is_food)
+        self.spawn_blobs(
+            xs + x0, ys + y0, self.params.MAX_SPAWN_ENERGY, self.seed_brains or 0
+        )
+
+    def spawn_blobs(
+        self, xs: np.ndarray, ys: np.ndarray, energy: int, brain: Any = 0
+    ) -> list[Blob]:
+        """Create and place one blob on each (x, y), in order.
+
+        Without a ``brain`` the random weights of the whole batch are drawn in
+        one go per layer instead of one ``Brain`` at a time. A list of brains
+        is cycled through, each blob getting its own copy.
+        """
+        n = len(xs)
+        self.blobs.reserve(n)
+        if brain == 0:
+            drawn = [
+                self.rng.standard_normal((n, n_in, n_out))
+                for n_in, n_out in BRAIN_LAYERS
+            ]
+            brains = [
+                Brain.from_weights([w[k] for w in drawn], copy=False) for k in range(n)
+            ]
+        elif isinstance(brain, list):
+            brains = [
+                Brain.from_weights(brain[k % len(brain)].weight) for k in range(n)
             ]
         else:
-            self.oldest_blob = 0
-            self.better_blob = 0
-            self.all_latest_behaviours = []
+            brains = [brain] * n
+        spawned = []
+        for x, y, blob_brain in zip(xs.tolist(), ys.tolist(), brains):
+            blob = Blob(x, y, energy, grid=self, brain=blob_brain)
+            self.place_blob(blob)
+            spawned.append(blob)
+        return spawned
 
-    def clear_cache(self) -> None:
-        self.scan_cache.clear()
-        self.cache_turn = -1
+    def track_birth(self, blob: Blob) -> None:
+        self.birth_order.append(blob)
+        if len(self.birth_order) > 2 * self.population + 64:
+            # Drop the dead piling up behind a long-lived blob
+            self.birth_order = deque(b for b in self.birth_order if b.slot >= 0)
+
+    def oldest(self, k: int = 1) -> list[Blob]:
+        """The ``k`` oldest live blobs, oldest first."""
+        while self.birth_order and self.birth_order[0].slot < 0:
+            self.birth_order.popleft()
+        oldest: list[Blob] = []
+        for blob in self.birth_order:
+            if len(oldest) == k:
+                break
+            if blob.slot >= 0:
+                oldest.append(blob)
+        return oldest
+
+    def best(self, k: int = 1) -> list[Blob]:
+        """The ``k`` live blobs with the most energy, best first."""
+        table = self.blobs
+        if k == 1:
+            slot = table.leader_slot()
+            best = table.objects[slot] if slot >= 0 else None
+            return [best] if best is not None else []
+        return [table.objects[slot] for slot in table.top_slots("energy", k)]
+
+    def update_data(self) -> None:
+        oldest = self.oldest()
+        best = self.best()
+        self.oldest_blob = oldest[0] if oldest else 0
+        self.better_blob = best[0] if best else 0
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-import gc
+from dataclasses import fields
+from typing import Any
 
-import numpy as np
 import pygame
 
 from . import constants as C
-from .entities import Blob, Grid
+from .checkpoint import load_checkpoint
+from .entities import Brain
+from .genomes import GenomeArchive
+from .render import RENDER_MODES, GridRenderer
+from .simulation import Simulation, SimulationParams
 from .state import state
 from .ui import (
     BackToMenuButton,
@@ -16,7 +20,12 @@ from .ui import (
     ParameterSlider,
     PauseButton,
     StartMenu,
+    draw_status,
+    get_font,
+    render_text,
+    show_status,
 )
+from .worker import SimulationWorker
 
 
 def init_pygame() -> None:
@@ -28,9 +37,9 @@ def init_pygame() -> None:
     base_font_size = 16
     base_font_petit = 12
     base_font_grand = 20
-    state.FONT = pygame.font.SysFont("comicsans", base_font_size)
-    state.FONT_PETIT = pygame.font.SysFont("comicsans", base_font_petit)
-    state.FONT_GRAND = pygame.font.SysFont("comicsans", base_font_grand)
+    state.FONT = get_font(base_font_size)
+    state.FONT_PETIT = get_font(base_font_petit)
+    state.FONT_GRAND = get_font(base_font_grand)
 
 
 def apply_menu_settings(menu: StartMenu) -> None:
@@ -43,11 +52,82 @@ def apply_menu_settings(menu: StartMenu) -> None:
     state.CELL_SIZE = C.HEIGHT / max(state.TAILLE_GRID, 1)
 
 
+def new_simulation() -> Simulation:
+    return Simulation(simulation_params(), genomes=state.seed_genomes)
+
+
+def simulation_params() -> SimulationParams:
+    return SimulationParams(
+        **{f.name: getattr(state, f.name) for f in fields(SimulationParams)}
+    )
+
+
 def pause(run: bool) -> bool:
     return not run
 
 
-def main() -> None:
+def archive_genomes(sim: Simulation) -> None:
+    """Append the genomes of the last oldest blob and of the hall of fame of
+    an extinct run."""
+    archive = GenomeArchive(C.GENOME_ARCHIVE)
+    oldest = sim.grid.oldest_blob
+    if oldest != 0:
+        archive.append([oldest], sim.turn)
+    archive.append_records(sim.hall_of_fame.entries)
+
+
+def stop_worker() -> None:
+    if state.worker is not None:
+        state.worker.stop()
+        state.worker = None
+
+
+def load_world(path: str) -> Simulation | None:
+    """Read a checkpoint and adopt its parameters as the UI settings."""
+    try:
+        sim = load_checkpoint(path)
+    except (OSError, KeyError, ValueError) as exc:
+        show_status(f"Could not load checkpoint {path}: {exc}")
+        return None
+    for f in fields(SimulationParams):
+        setattr(state, f.name, getattr(sim.params, f.name))
+    state.CELL_SIZE = C.HEIGHT / max(state.TAILLE_GRID, 1)
+    return sim
+
+
+def start_worker(sim: Simulation) -> SimulationWorker:
+    """Step ``sim`` on a worker thread; from here on the UI only reads its
+    snapshots."""
+    stop_worker()
+    state.sim = sim
+    worker = SimulationWorker(
+        state.sim, state.target_fps, on_extinction=archive_genomes
+    )
+    worker.paused = not state.sim_running
+    worker.start()
+    state.worker = worker
+    return worker
+
+
+def worker_controls() -> dict[str, Any]:
+    """What the worker should currently be running with, by command name."""
+    return {
+        "params": {
+            f.name: getattr(state, f.name)
+            for f in fields(SimulationParams)
+            # The grid size is fixed for the lifetime of a simulation
+            if f.name != "TAILLE_GRID"
+        },
+        "rate": state.target_fps,
+        "pause": not state.sim_running,
+        "turbo": state.turbo,
+        "budget": state.turbo_budget_ms,
+        "image": GridRenderer.image_key(state.CELL_SIZE, state.render_mode),
+    }
+
+
+def main(genomes: list[Brain] | None = None) -> None:
+    state.seed_genomes = genomes or []
     init_pygame()
     clock = pygame.time.Clock()
     state.image_manager = ImageManager()
@@ -55,6 +135,7 @@ def main() -> None:
     # Positions and sizes will be scaled at draw time
     fps_slider = FPSSlider(C.WIDTH + C.WIDTH_INFO - 30 - 240, 150, 240, 20, 1, 120)
     monitor = LightweightMonitor()
+    grid_renderer = GridRenderer()
     back_btn = BackToMenuButton(10, 10, 50)
     pause_btn = PauseButton(80, 10, 120, 40)
 
@@ -134,17 +215,14 @@ def main() -> None:
 
     state.running = True
     state.sim_running = True
-    state.turn = 0
     state.target_fps = 30
-    last_update_time = 0
-    update_interval = 1000 // max(state.target_fps, 1)
-    memory_cleanup_counter = 0
-    state.grid = Grid(list_blobs=[])
-    state.grid.update_data()
+    # Last value sent to the worker for each command
+    sent_controls: dict[str, Any] = {}
 
     while state.running:
-        current_time = pygame.time.get_ticks()
         for event in pygame.event.get():
+            # Simulation to switch to once the event is handled
+            new_sim: Simulation | None = None
             if event.type == pygame.QUIT:
                 state.running = False
                 break
@@ -173,15 +251,36 @@ def main() -> None:
                 scaled = max(8, int(base_font_size * state.SCALE_Y))
                 scaled_petit = max(6, int(base_font_petit * state.SCALE_Y))
                 scaled_grand = max(10, int(base_font_grand * state.SCALE_Y))
-                state.FONT = pygame.font.SysFont("comicsans", scaled)
-                state.FONT_PETIT = pygame.font.SysFont("comicsans", scaled_petit)
-                state.FONT_GRAND = pygame.font.SysFont("comicsans", scaled_grand)
+                state.FONT = get_font(scaled)
+                state.FONT_PETIT = get_font(scaled_petit)
+                state.FONT_GRAND = get_font(scaled_grand)
             if (
                 event.type == pygame.KEYDOWN
                 and event.key == pygame.K_SPACE
                 and state.game_state == "simulation"
             ):
                 state.sim_running = pause(state.sim_running)
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_r
+                and state.game_state == "simulation"
+            ):
+                next_mode = RENDER_MODES.index(state.render_mode) + 1
+                state.render_mode = RENDER_MODES[next_mode % len(RENDER_MODES)]
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_t
+                and state.game_state == "simulation"
+            ):
+                state.turbo = not state.turbo
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_s
+                and state.worker is not None
+            ):
+                state.worker.send("checkpoint", C.CHECKPOINT_PATH)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_l:
+                new_sim = load_world(C.CHECKPOINT_PATH)
             if state.game_state == "menu":
                 # Ensure slider positions reflect current scaling before handling events
                 scale_x = state.SCALE_X or 1.0
@@ -201,20 +300,7 @@ def main() -> None:
                 menu_action = start_menu.handle_event(event)
                 if menu_action == "start":
                     apply_menu_settings(start_menu)
-                    if state.image_manager:
-                        state.image_manager.rescale(state.CELL_SIZE)
-                    state.grid = Grid(list_blobs=[])
-                    state.grid.update_data()
-                    state.turn = 0
-                    for k in (
-                        "MUTATION_RATE",
-                        "FOOD_RATE",
-                        "SPAWN_RATE",
-                        "SCAN_RANGE",
-                    ):
-                        realtime_sliders[k].current_val = getattr(state, k)
-                    realtime_sliders["BASE_ENERGY"].current_val = state.MAX_SPAWN_ENERGY
-                    state.game_state = "simulation"
+                    new_sim = new_simulation()
             elif state.game_state == "simulation":
                 # Update control positions based on current scale before handling events
                 scale_x = state.SCALE_X or 1.0
@@ -226,6 +312,7 @@ def main() -> None:
                 if pause_btn.handle_event(event):
                     state.sim_running = pause(state.sim_running)
                 if back_btn.handle_event(event):
+                    stop_worker()
                     state.game_state = "menu"
                 left_x = int((C.WIDTH + C.WIDTH_INFO - 30 - rt_slider_width) * scale_x)
                 start_y = int(320 * scale_y)
@@ -240,6 +327,21 @@ def main() -> None:
                         slider_height,
                     )
                     slider.handle_event(event)
+            if new_sim is not None:
+                if state.image_manager:
+                    state.image_manager.rescale(state.CELL_SIZE)
+                start_worker(new_sim)
+                sent_controls.clear()
+                for k in (
+                    "MUTATION_RATE",
+                    "FOOD_RATE",
+                    "RESET_FOOD_RATE",
+                    "SPAWN_RATE",
+                    "SCAN_RANGE",
+                ):
+                    realtime_sliders[k].current_val = getattr(state, k)
+                realtime_sliders["BASE_ENERGY"].current_val = state.MAX_SPAWN_ENERGY
+                state.game_state = "simulation"
 
         if state.game_state == "menu":
             pass
@@ -253,75 +355,49 @@ def main() -> None:
             state.SCAN_RANGE = int(realtime_sliders["SCAN_RANGE"].current_val)
             state.MAX_SPAWN_ENERGY = int(realtime_sliders["BASE_ENERGY"].current_val)
             state.target_fps = fps_slider.current_fps
-            update_interval = 1000 // max(state.target_fps, 1)
-            if current_time - last_update_time >= update_interval:
-                if state.sim_running and state.grid is not None:
-                    memory_cleanup_counter += 1
-                    if memory_cleanup_counter >= 100:
-                        gc.collect()
-                        memory_cleanup_counter = 0
-                    blobs_to_process: list[Blob] = state.grid.list_blobs.copy()
-                    for blob in blobs_to_process:
-                        if blob in state.grid.list_blobs:
-                            blob.main()
-                    if state.turn % 4 == 0 and state.turn != 0:
-                        state.grid.reset_food()
-                    if state.turn % (1000 // C.REPRODUCE_RATE) == 0 and state.turn != 0:
-                        blobs_to_reproduce = state.grid.list_blobs.copy()
-                        for blob in blobs_to_reproduce:
-                            if blob in state.grid.list_blobs:
-                                blob.reproduce()
-                    monitor.update_stats(state.grid.list_blobs, state.grid)
-                    if len(state.grid.list_blobs) <= 0:
-                        if state.grid.oldest_blob != 0:
-                            with open("oldest.txt", "w") as file:
-                                for line in state.grid.oldest_blob.brain.weight:
-                                    file.write(np.array2string(line))
-                        state.grid.reset_map()
-                        state.game_state = "menu"
-                    state.turn += 1
-                last_update_time = current_time
+            if state.worker is not None:
+                for command, value in worker_controls().items():
+                    if sent_controls.get(command) != value:
+                        state.worker.send(command, value)
+                        sent_controls[command] = value
+                snapshot = state.worker.latest()
+                if snapshot.turn != monitor.turn or snapshot.extinct:
+                    monitor.update_stats(snapshot)
+                if snapshot.extinct:
+                    stop_worker()
+                    state.game_state = "menu"
 
         assert state.WIN is not None
         state.WIN.fill((0, 0, 0))
         if state.game_state == "menu":
             start_menu.draw(state.WIN)
-        elif state.game_state == "simulation":
-            state.grid.update_data()
+        elif state.game_state == "simulation" and state.worker is not None:
+            snapshot = state.worker.latest()
             # Scale anchor positions for right panel
             monitor_x = int((C.WIDTH + 30) * (state.SCALE_X or 1.0))
             monitor_y = int(60 * (state.SCALE_Y or 1.0))
             monitor.draw(state.WIN, monitor_x, monitor_y)
-            for i in range(state.TAILLE_GRID):
-                for j in range(state.TAILLE_GRID):
-                    current_object = state.grid.grid[i][j]
-                    if current_object:
-                        current_object[0].update()
-                        current_object[0].draw(state.WIN)
+            grid_size = snapshot.size
+            grid_renderer.draw(state.WIN, snapshot, state.CELL_SIZE, state.render_mode)
             # Hover tooltip for blob stats
             try:
                 mouse_x, mouse_y = pygame.mouse.get_pos()
-                grid_pixel_size = int(state.CELL_SIZE * state.TAILLE_GRID)
+                grid_pixel_size = int(state.CELL_SIZE * grid_size)
                 if 0 <= mouse_x < grid_pixel_size and 0 <= mouse_y < grid_pixel_size:
                     cell_x = int(mouse_x // max(state.CELL_SIZE, 1))
                     cell_y = int(mouse_y // max(state.CELL_SIZE, 1))
-                    cell_x = max(0, min(state.TAILLE_GRID - 1, cell_x))
-                    cell_y = max(0, min(state.TAILLE_GRID - 1, cell_y))
-                    cell = state.grid.grid[cell_x][cell_y]
-                    if (
-                        cell
-                        and isinstance(cell[0], Blob)
-                        and state.FONT_PETIT
-                        and state.FONT
-                    ):
-                        blob = cell[0]
-                        last_beh = blob.behaviour[-1] if blob.behaviour else "none"
-                        age = max(0, state.turn - blob.birth_turn)
+                    cell_x = max(0, min(grid_size - 1, cell_x))
+                    cell_y = max(0, min(grid_size - 1, cell_y))
+                    # Blobs hidden under food are not in the snapshot's cells
+                    row = snapshot.blob_at(cell_x, cell_y)
+                    if row >= 0 and state.FONT_PETIT and state.FONT:
+                        last_beh = snapshot.last_behaviour(row)
+                        age = max(0, snapshot.age(row))
                         # Behaviour percentages
-                        perc = blob.behaviour_percentages()
+                        perc = snapshot.behaviour_percentages(row)
                         lines = [
-                            f"Blob {blob.id}",
-                            f"Energy: {blob.energy}",
+                            f"Blob {snapshot.ids[row]}",
+                            f"Energy: {snapshot.energy[row]}",
                             f"Age: {age}",
                             f"Last: {last_beh}",
                             "Actions:",
@@ -333,7 +409,7 @@ def main() -> None:
                         # Compute tooltip size
                         padding = 6
                         text_surfaces = [
-                            state.FONT_PETIT.render(t, True, C.COLOR["WHITE"])
+                            render_text(state.FONT_PETIT, t, C.COLOR["WHITE"])
                             for t in lines
                         ]
                         width = (
@@ -376,8 +452,10 @@ def main() -> None:
             fps_slider.draw(state.WIN)
             state.current_fps = clock.get_fps()
             if state.FONT_PETIT:
-                fps_text = state.FONT_PETIT.render(
-                    f"Current FPS: {state.current_fps:.1f}", True, C.COLOR["ORANGE"]
+                fps_text = render_text(
+                    state.FONT_PETIT,
+                    f"Current FPS: {state.current_fps:.1f}",
+                    C.COLOR["ORANGE"],
                 )
                 state.WIN.blit(
                     fps_text,
@@ -405,10 +483,12 @@ def main() -> None:
                 slider.draw(state.WIN)
             back_btn.draw(state.WIN)
             pause_btn.draw(state.WIN, state.sim_running)
+        draw_status(state.WIN)
 
         pygame.display.update()
-        clock.tick(60)
+        clock.tick(C.UI_FPS)
 
+    stop_worker()
     pygame.quit()
 
 
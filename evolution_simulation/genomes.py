@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .entities import BRAIN_LAYERS, Blob, BlobTable, Brain
+
+if TYPE_CHECKING:
+    from .simulation import Simulation
+
+# One fixed-size record per archived genome: full-precision weights of every
+# brain layer plus where the genome came from
+GENOME_DTYPE = np.dtype(
+    [
+        ("id", np.int64),
+        ("parents", np.int64, (2,)),
+        ("turn", np.int64),
+        ("birth_turn", np.int64),
+        ("energy", np.int64),
+        *[
+            (f"layer_{i}", np.float64, (n_in, n_out))
+            for i, (n_in, n_out) in enumerate(BRAIN_LAYERS)
+        ],
+    ]
+)
+# Start of every archive file; records follow back to back
+GENOME_MAGIC = b"evo-genomes-v1\n\x00"
+# Hall of fame entries: a genome record plus its fitness and weight hash
+HALL_DTYPE = np.dtype(
+    GENOME_DTYPE.descr + [("fitness", np.float64), ("hash", np.uint64)]
+)
+
+# Fitness terms of the live blobs in ``slots`` at ``turn``; higher is better
+FITNESS: dict[str, Callable[[BlobTable, np.ndarray, int], np.ndarray]] = {
+    "age": lambda table, slots, turn: turn - table.birth_turn[slots],
+    "energy": lambda table, slots, turn: table.energy[slots],
+    "offspring": lambda table, slots, turn: table.offspring[slots],
+}
+
+
+def genome_record(blob: Blob, turn: int, dtype: np.dtype = GENOME_DTYPE) -> np.ndarray:
+    """``blob``'s brain and metadata as a one-element ``dtype`` array (any
+    field not in ``GENOME_DTYPE`` is left at zero)."""
+    record = np.zeros(1, dtype=dtype)
+    record["id"] = blob.id
+    record["parents"] = blob.parent_ids or (0, 0)
+    record["turn"] = turn
+    record["birth_turn"] = blob.birth_turn
+    record["energy"] = blob.energy
+    for i, weight in enumerate(blob.brain.weight):
+        record[f"layer_{i}"] = weight
+    return record
+
+
+def genome_hash(weights: list[np.ndarray], quantum: float) -> int:
+    """64-bit hash of ``weights`` rounded to multiples of ``quantum``, so
+    weight sets closer than that almost always collide."""
+    digest = hashlib.blake2b(digest_size=8)
+    for weight in weights:
+        digest.update(np.round(np.asarray(weight) / quantum).astype(np.int64).tobytes())
+    return int.from_bytes(digest.digest(), "little")
+
+
+def record_brains(records: np.ndarray) -> list[Brain]:
+    """Unattached brains holding copies of the weights of ``records``."""
+    return [
+        Brain.from_weights(
+            [np.array(record[f"layer_{i}"]) for i in range(len(BRAIN_LAYERS))],
+            copy=False,
+        )
+        for record in records
+    ]
+
+
+class GenomeArchive:
+    """Append-only binary file of ``GENOME_DTYPE`` records.
+
+    Appending writes the raw records at the end of the file and reading maps
+    it with ``np.memmap``, so neither costs more than the records touched.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def append(self, blobs: list[Blob], turn: int) -> None:
+        records = (
+            np.concatenate([genome_record(blob, turn) for blob in blobs])
+            if blobs
+            else np.zeros(0, dtype=GENOME_DTYPE)
+        )
+        with self.path.open("ab") as file:
+            if file.tell() == 0:
+                file.write(GENOME_MAGIC)
+            file.write(records.tobytes())
+
+    def append_records(self, records: np.ndarray) -> None:
+        """Append records of any dtype holding the ``GENOME_DTYPE`` fields,
+        e.g. hall of fame entries."""
+        genomes = np.zeros(len(records), dtype=GENOME_DTYPE)
+        for name in GENOME_DTYPE.names or ():
+            genomes[name] = records[name]
+        with self.path.open("ab") as file:
+            if file.tell() == 0:
+                file.write(GENOME_MAGIC)
+            file.write(genomes.tobytes())
+
+    def read(self) -> np.ndarray:
+        """All records, memory-mapped read-only (empty if there is no file)."""
+        if not self.path.exists():
+            return np.zeros(0, dtype=GENOME_DTYPE)
+        with self.path.open("rb") as file:
+            magic = file.read(len(GENOME_MAGIC))
+        if magic != GENOME_MAGIC:
+            raise ValueError(f"{self.path} is not a genome archive")
+        size = self.path.stat().st_size - len(GENOME_MAGIC)
+        if size % GENOME_DTYPE.itemsize:
+            raise ValueError(f"{self.path} ends with a truncated record")
+        if size == 0:
+            return np.zeros(0, dtype=GENOME_DTYPE)
+        return np.memmap(
+            self.path, dtype=GENOME_DTYPE, mode="r", offset=len(GENOME_MAGIC)
+        )
+
+    def __len__(self) -> int:
+        return len(self.read())
+
+    def brains(self, last: int | None = None) -> list[Brain]:
+        """Unattached brains of the archived genomes, or of the ``last`` most
+        recently archived ones, oldest first."""
+        records = self.read()
+        if last is not None:
+            records = records[max(0, len(records) - last) :]
+        return record_brains(records)
+
+
+class HallOfFame:
+    """The ``capacity`` fittest genomes seen during a run, fittest first.
+
+    ``fitness`` names a term of ``FITNESS`` or weighs several of them, e.g.
+    ``{"age": 1.0, "offspring": 50.0}``. Each ``update`` scores the live
+    blobs, and the best of them replace weaker entries. Genomes whose weights
+    hash the same (see ``genome_hash``) count as one: a blob already in the
+    hall only has its entry refreshed when it scores better. Entries are plain
+    ``HALL_DTYPE`` records, so the blobs themselves are never kept alive.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        fitness: str | dict[str, float] = "age",
+        quantum: float = 1e-6,
+    ) -> None:
+        self.capacity = capacity
+        self.weights = {fitness: 1.0} if isinstance(fitness, str) else dict(fitness)
+        unknown = set(self.weights) - set(FITNESS)
+        if unknown:
+            raise ValueError(f"unknown fitness terms: {sorted(unknown)}")
+        self.quantum = quantum
+        self.entries = np.zeros(0, dtype=HALL_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def score(self, sim: Simulation, slots: np.ndarray) -> np.ndarray:
+        total = np.zeros(len(slots))
+        for term, weight in self.weights.items():
+            total += weight * FITNESS[term](sim.grid.blobs, slots, sim.turn)
+        return total
+
+    def update(self, sim: Simulation) -> None:
+        table = sim.grid.blobs
+        slots = table.live_slots()
+        if not len(slots) or not self.capacity:
+            return
+        fitness = self.score(sim, slots)
+        k = min(self.capacity, len(slots))
+        top = np.argpartition(-fitness, k - 1)[:k]
+        merged = {int(entry["hash"]): entry for entry in self.entries}
+        for index in top.tolist():
+            blob = table.objects[slots[index]]
+            assert blob is not None
+            key = genome_hash(blob.brain.weight, self.quantum)
+            known = merged.get(key)
+            if known is not None and known["fitness"] >= fitness[index]:
+                continue
+            record = genome_record(blob, sim.turn, HALL_DTYPE)[0]
+            record["fitness"] = fitness[index]
+            record["hash"] = key
+            merged[key] = record
+        entries = np.array(list(merged.values()), dtype=HALL_DTYPE)
+        # Fittest first, the earlier born first among equals
+        order = np.lexsort((entries["id"], -entries["fitness"]))
+        self.entries = entries[order[: self.capacity]]
+
+    def best(self, n: int = 1) -> np.ndarray:
+        return self.entries[:n].copy()
+
+    def brains(self, n: int | None = None) -> list[Brain]:
+        """Brains of the ``n`` fittest entries (all by default), e.g. to
+        reseed ``Grid.reset_spawn`` or a new world."""
+        return record_brains(self.entries[:n])
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import time
+from dataclasses import asdict
+from multiprocessing.connection import Connection
+from typing import Any
+
+import numpy as np
+
+from .entities import Blob
+from .genomes import HALL_DTYPE, HallOfFame, record_brains
+from .simulation import Simulation, SimulationParams
+
+# Who sends migrants to whom after every epoch
+TOPOLOGIES: list[str] = ["ring", "full", "random"]
+
+
+def migration_routes(
+    n: int, topology: str, rng: np.random.Generator
+) -> list[list[int]]:
+    """For each island, the islands it receives migrants from."""
+    if n < 2:
+        return [[] for _ in range(n)]
+    if topology == "ring":
+        return [[(i - 1) % n] for i in range(n)]
+    if topology == "full":
+        return [[j for j in range(n) if j != i] for i in range(n)]
+    if topology == "random":
+        # Every island sends to one other island picked at random
+        sources: list[list[int]] = [[] for _ in range(n)]
+        for i in range(n):
+            target = int(rng.integers(n - 1))
+            sources[target + (target >= i)].append(i)
+        return sources
+    raise ValueError(f"unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+
+
+def settle(sim: Simulation, records: np.ndarray) -> int:
+    """Spawn one blob per genome record on random empty cells of ``sim``;
+    returns how many found room."""
+    grid = sim.grid
+    free = np.flatnonzero((grid.occupancy < 0) & (grid.food == 0))
+    count = min(len(records), len(free))
+    if not count:
+        return 0
+    cells = sim.rng.choice(free, count, replace=False)
+    xs, ys = np.divmod(cells, grid.food.shape[1])
+    brains = record_brains(records[:count])
+    grid.spawn_blobs(xs, ys, sim.params.MAX_SPAWN_ENERGY, brains)
+    return count
+
+
+def island_main(
+    conn: Connection,
+    params: dict[str, Any],
+    rng: np.random.Generator,
+    migrants: int,
+    fitness: str | dict[str, float],
+) -> None:
+    """Body of one island process: play epochs on request until told to stop.
+
+    Each request is ``(turns, immigrants)``; the reply carries the island's
+    stats and its ``migrants`` fittest live genomes (``HALL_DTYPE``
+    records).
+    """
+    Blob.NEXT_ID = 1
+    sim = Simulation(SimulationParams(**params), rng=rng)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        turns, immigrants = request
+        arrived = settle(sim, immigrants)
+        start = time.perf_counter()
+        first = sim.turn
+        while sim.turn < first + turns and not sim.extinct:
+            sim.step()
+        elapsed = time.perf_counter() - start
+        emigrants = HallOfFame(migrants, fitness)
+        emigrants.update(sim)
+        population = sim.grid.population
+        stats = {
+            "turn": sim.turn,
+            "population": population,
+            "mean_energy": (
+                sim.grid.blobs.totals["energy"] / population if population else 0.0
+            ),
+            "best_fitness": (
+                float(emigrants.entries["fitness"][0]) if len(emigrants) else 0.0
+            ),
+            "arrived": arrived,
+            "turns_per_sec": (sim.turn - first) / elapsed if elapsed > 0 else 0.0,
+        }
+        conn.send((stats, emigrants.entries))
+    conn.close()
+
+
+class IslandModel:
+    """Independent worlds evolving in separate processes, exchanging their
+    fittest genomes every ``interval`` turns.
+
+    Each epoch every island plays ``interval`` turns in parallel, then sends
+    its ``migrants`` fittest live genomes (by ``fitness``, see
+    ``genomes.FITNESS``) to the islands ``topology`` connects it to, which
+    spawn them on empty cells at the start of the next epoch. Only weight
+    records travel between processes, through pipes.
+    """
+
+    def __init__(
+        self,
+        islands: int,
+        params: SimulationParams | None = None,
+        interval: int = 100,
+        topology: str = "ring",
+        migrants: int = 2,
+        fitness: str | dict[str, float] = "age",
+        seed: int = 0,
+    ) -> None:
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f"unknown topology {topology!r}, expected one of {TOPOLOGIES}"
+            )
+        self.interval = interval
+        self.topology = topology
+        # Generator.spawn needs NumPy 1.25; the seed sequence spawns the
+        # same child streams on older versions
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.epoch = 0
+        settings = asdict(params or SimulationParams())
+        streams = [
+            np.random.default_rng(child) for child in self.seed_sequence.spawn(islands)
+        ]
+        self.connections: list[Connection] = []
+        self.processes: list[mp.Process] = []
+        for island in range(islands):
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=island_main,
+                args=(child, settings, streams[island], migrants, fitness),
+                name=f"island-{island}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.inbox: list[list[np.ndarray]] = [[] for _ in range(islands)]
+
+    def step(self) -> list[dict[str, Any]]:
+        """Play one epoch on every island and route the migrants; returns
+        each island's stats."""
+        for conn, arrivals in zip(self.connections, self.inbox):
+            immigrants = (
+                np.concatenate(arrivals) if arrivals else np.zeros(0, dtype=HALL_DTYPE)
+            )
+            conn.send((self.interval, immigrants))
+        replies = [conn.recv() for conn in self.connections]
+        routes = migration_routes(len(replies), self.topology, self.rng)
+        self.inbox = [[replies[j][1] for j in sources] for sources in routes]
+        self.epoch += 1
+        return [stats for stats, _ in replies]
+
+    def close(self) -> None:
+        for conn in self.connections:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+
+    def __enter__(self) -> IslandModel:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Evolve several worlds in parallel with periodic migration."
+    )
+    parser.add_argument("--islands", type=int, default=mp.cpu_count())
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--interval", type=int, default=100, help="turns per epoch")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="ring")
+    parser.add_argument("--migrants", type=int, default=2, help="per island and epoch")
+    parser.add_argument("--fitness", default="age", help="age, energy or offspring")
+    parser.add_argument("--grid", type=int, default=SimulationParams().TAILLE_GRID)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    params = SimulationParams(TAILLE_GRID=args.grid)
+    start = time.perf_counter()
+    with IslandModel(
+        args.islands,
+        params,
+        args.interval,
+        args.topology,
+        args.migrants,
+        args.fitness,
+        args.seed,
+    ) as model:
+        for _ in range(args.epochs):
+            stats = model.step()
+            populations = [s["population"] for s in stats]
+            print(
+                f"epoch {model.epoch}: populations {populations}, "
+                f"best fitness {max(s['best_fitness'] for s in stats):.0f}, "
+                f"{sum(s['turns_per_sec'] for s in stats):.0f} turns/s overall"
+            )
+    print(f"{args.epochs} epochs in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
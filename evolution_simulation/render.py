@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from . import constants as C
+from .state import state
+
+if TYPE_CHECKING:
+    from .worker import Snapshot
+
+# Order the R key cycles through; "auto" picks a level from the cell size
+RENDER_MODES: list[str] = ["auto", "sprites", "pixels", "blocks"]
+
+
+class GridRenderer:
+    """Draws a ``Snapshot`` of the grid at a level of detail suited to the
+    cell size.
+
+    - ``sprites``: one sprite or circle per entity, for large cells.
+    - ``pixels``: one pixel per cell built from the world arrays (food
+      yellow, blobs coloured by energy, the best blob highlighted), filled
+      with a single ``surfarray.blit_array`` and scaled onto the window.
+    - ``blocks``: when cells are smaller than a screen pixel, square blocks of
+      cells are reduced to one pixel coloured by their food and blob density,
+      so the image never has more pixels than the window.
+
+    Empty cells are transparent, like the background around sprites. The
+    worker builds the image for the ``image_key`` the UI last sent it, so
+    the UI thread only falls back to building one when the zoom or mode just
+    changed. The scaled surface is kept until the snapshot, level, block
+    factor or window size changes.
+    """
+
+    def __init__(self) -> None:
+        self.surface: pygame.Surface | None = None
+        self.scaled: pygame.Surface | None = None
+        # (snapshot, level, factor, pixel_size) the scaled surface was drawn for
+        self.scaled_for: tuple[Snapshot, str, int, int] | None = None
+
+    @staticmethod
+    def level(cell_size: float, mode: str = "auto") -> str:
+        if mode != "auto":
+            return mode
+        if cell_size >= C.LOD_SPRITE_MIN_CELL:
+            return "sprites"
+        if cell_size >= 1:
+            return "pixels"
+        return "blocks"
+
+    @classmethod
+    def image_key(cls, cell_size: float, mode: str = "auto") -> tuple[str, int] | None:
+        """(level, block factor) of the image drawn at this cell size, or
+        None when entities are drawn one by one."""
+        level = cls.level(cell_size, mode)
+        if level == "sprites":
+            return None
+        if level == "blocks":
+            return level, max(1, math.ceil(1 / max(cell_size, 1e-6)))
+        return level, 1
+
+    @classmethod
+    def image(cls, snapshot: Snapshot, key: tuple[str, int]) -> np.ndarray:
+        level, factor = key
+        if level == "blocks":
+            return cls.blocks(snapshot, factor)
+        return cls.pixels(snapshot)
+
+    @staticmethod
+    def visible_blobs(snapshot: Snapshot) -> np.ndarray:
+        """Snapshot rows of the blobs that get drawn."""
+        rows = np.arange(len(snapshot.ids), dtype=np.int32)
+        shown = snapshot.cells[snapshot.xs, snapshot.ys] == rows
+        result: np.ndarray = rows[shown & (snapshot.energy > 0)]
+        return result
+
+    @staticmethod
+    def visible_best(snapshot: Snapshot) -> int:
+        """Row of the best blob if it gets drawn, otherwise -1."""
+        best = snapshot.best
+        if best < 0 or snapshot.energy[best] <= 0:
+            return -1
+        if snapshot.cells[snapshot.xs[best], snapshot.ys[best]] != best:
+            return -1
+        return best
+
+    @classmethod
+    def pixels(cls, snapshot: Snapshot) -> np.ndarray:
+        """RGB image of the grid indexed ``[x, y]``, one pixel per cell."""
+        food = snapshot.food
+        image = np.zeros(food.shape + (3,), dtype=np.uint8)
+        rows = cls.visible_blobs(snapshot)
+        image[snapshot.xs[rows], snapshot.ys[rows]] = snapshot.colors[rows]
+        image[food > 0] = C.COLOR["YELLOW"]
+        best = cls.visible_best(snapshot)
+        if best >= 0:
+            image[snapshot.xs[best], snapshot.ys[best]] = C.COLOR["YELLOW"]
+        return image
+
+    @classmethod
+    def blocks(cls, snapshot: Snapshot, factor: int) -> np.ndarray:
+        """RGB image with one pixel per ``factor`` x ``factor`` block of cells.
+
+        Each pixel blends food yellow and the colour of the block's average
+        blob energy by how much of the block they cover, brightened so a
+        single entity in a block stays visible.
+        """
+        size = snapshot.size
+        n = -(-size // factor)
+
+        food = (snapshot.food > 0).view(np.int8)
+        if n * factor != size:
+            padded = np.zeros((n * factor, n * factor), dtype=np.int8)
+            padded[:size, :size] = food
+            food = padded
+        food_count = food.reshape(n, factor, n * factor).sum(axis=1)
+        food_count = food_count.reshape(n, n, factor).sum(axis=2)
+        # Blobs are summed per block from their coordinates, not a full grid
+        rows = cls.visible_blobs(snapshot)
+        block = (snapshot.xs[rows] // factor) * n + snapshot.ys[rows] // factor
+        blob_count = np.bincount(block, minlength=n * n).reshape(n, n)
+        energy = snapshot.energy[rows].astype(np.float64)
+        blob_energy = np.bincount(block, energy, minlength=n * n).reshape(n, n)
+        area = factor * factor
+        food_share = food_count / area
+        blob_share = blob_count / area
+        mean_energy = blob_energy / np.maximum(blob_count, 1)
+        blob_color = np.stack(
+            [
+                np.zeros_like(mean_energy),
+                np.minimum(mean_energy * 5, 255),
+                np.maximum(0, 255 - mean_energy * 5),
+            ],
+            axis=-1,
+        )
+        covered = food_share + blob_share
+        mix = (
+            np.array(C.COLOR["YELLOW"], dtype=np.float64) * food_share[..., None]
+            + blob_color * blob_share[..., None]
+        ) / np.maximum(covered, 1e-9)[..., None]
+        brightness = np.minimum(1.0, covered * C.LOD_BLOCK_GAIN)
+        return (mix * brightness[..., None]).astype(np.uint8)
+
+    def draw(
+        self,
+        win: pygame.Surface,
+        snapshot: Snapshot,
+        cell_size: float,
+        mode: str = "auto",
+    ) -> None:
+        key = self.image_key(cell_size, mode)
+        if key is None:
+            self.draw_sprites(win, snapshot, cell_size)
+            return
+        pixel_size = max(1, int(cell_size * snapshot.size))
+        cached = self.scaled_for
+        if (
+            self.scaled is None
+            or cached is None
+            or cached[0] is not snapshot
+            or cached[1:] != (*key, pixel_size)
+        ):
+            image = snapshot.image
+            if image is None or snapshot.image_key != key:
+                image = self.image(snapshot, key)
+            if self.surface is None or self.surface.get_size() != image.shape[:2]:
+                self.surface = pygame.Surface(image.shape[:2])
+                self.surface.set_colorkey((0, 0, 0))
+            pygame.surfarray.blit_array(self.surface, image)
+            self.scaled = pygame.transform.scale(self.surface, (pixel_size, pixel_size))
+            self.scaled_for = (snapshot, *key, pixel_size)
+        win.blit(self.scaled, (0, 0))
+        best = self.visible_best(snapshot)
+        if best >= 0:
+            center = self.center(snapshot, best, cell_size)
+            radius = max(cell_size / 2 + 1, 3)
+            pygame.draw.circle(win, C.COLOR["RED"], center, radius, width=2)
+
+    @staticmethod
+    def center(snapshot: Snapshot, row: int, cell_size: float) -> tuple[float, float]:
+        return (
+            (int(snapshot.xs[row]) + 0.5) * cell_size,
+            (int(snapshot.ys[row]) + 0.5) * cell_size,
+        )
+
+    def draw_sprites(
+        self, win: pygame.Surface, snapshot: Snapshot, cell_size: float
+    ) -> None:
+        images = state.image_manager
+        food_image = images.food_image if images else None
+        food_xs, food_ys = np.nonzero(snapshot.food)
+        for x, y in zip(food_xs.tolist(), food_ys.tolist()):
+            if food_image is not None:
+                win.blit(food_image, (x * cell_size, y * cell_size))
+            else:
+                center = ((x + 0.5) * cell_size, (y + 0.5) * cell_size)
+                pygame.draw.circle(win, C.COLOR["YELLOW"], center, cell_size / 4)
+        best = self.visible_best(snapshot)
+        radius = cell_size / 2
+        for row in self.visible_blobs(snapshot).tolist():
+            r, g, b = snapshot.colors[row].tolist()
+            color = C.COLOR["YELLOW"] if row == best else (r, g, b)
+            sprite = images.tinted_blob(color) if images else None
+            if sprite is not None:
+                x, y = int(snapshot.xs[row]), int(snapshot.ys[row])
+                win.blit(sprite, (x * cell_size, y * cell_size))
+            else:
+                pygame.draw.circle(
+                    win, color, self.center(snapshot, row, cell_size), radius
+                )
+        if best >= 0:
+            # Highlighted: red outline around the yellow blob
+            pygame.draw.circle(
+                win,
+                C.COLOR["RED"],
+                self.center(snapshot, best, cell_size),
+                radius + 1,
+                width=2,
+            )
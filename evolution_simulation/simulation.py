@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import constants as C
+from .entities import Blob, Brain, Grid
+from .genomes import HallOfFame
+
+
+@dataclass
+class SimulationParams:
+    # Same names as the dynamic parameters of AppState so the UI can copy them over
+    TAILLE_GRID: int = C.TAILLE_GRID
+    MAX_SPAWN_ENERGY: int = C.MAX_SPAWN_ENERGY
+    MUTATION_RATE: float = C.MUTATION_RATE
+    FOOD_RATE: float = C.FOOD_RATE
+    RESET_FOOD_RATE: float = C.RESET_FOOD_RATE
+    SPAWN_RATE: float = C.SPAWN_RATE
+    RESET_SPAWN_RATE: float = C.RESET_SPAWN_RATE
+    SCAN_RANGE: int = C.SCAN_RANGE
+
+
+class Simulation:
+    """Headless simulation engine.
+
+    Owns its grid, turn counter and parameters and never touches pygame or the
+    global ``state``, so it can be stepped as fast as the CPU allows.
+
+    Every random draw of the run comes from ``rng``, a ``np.random.Generator``
+    (or the seed of a new one), so the same seed replays the same run. Worker
+    processes should get generators built from ``SeedSequence.spawn()``
+    children rather than reseed, so their streams never overlap.
+    """
+
+    def __init__(
+        self,
+        params: SimulationParams | None = None,
+        populate: bool = True,
+        genomes: list[Brain] | None = None,
+        shape: tuple[int, int] | None = None,
+        rng: np.random.Generator | int | None = None,
+    ) -> None:
+        self.params = params or SimulationParams()
+        self.rng = (
+            rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        )
+        self.turn = 0
+        self.hall_of_fame = HallOfFame(C.HALL_OF_FAME_SIZE, C.HALL_OF_FAME_FITNESS)
+        # An empty world is only useful to restore a checkpoint into;
+        # ``genomes`` seed the initial population instead of random brains
+        self.grid = Grid(self, populate, genomes, shape)
+
+    @property
+    def extinct(self) -> bool:
+        return self.grid.population == 0
+
+    def step(self) -> None:
+        # Blobs born during the turn wait for the next one
+        self.play(self.grid.blobs.live_slots())
+        self.end_turn()
+
+    def play(self, slots: np.ndarray) -> None:
+        """Let the blobs in ``slots`` act once, in order; a blob killed
+        earlier in the turn (slot -1) is skipped."""
+        if not len(slots):
+            return
+        table = self.grid.blobs
+        blobs_to_process: list[Blob] = [table.objects[slot] for slot in slots.tolist()]
+        # Every blob perceives the world as it is at the start of the turn,
+        # so the whole population can be evaluated in one batched call.
+        table.drain_energy(slots, C.ENERGY_DECAY_PER_TURN)
+        inputs = self.grid.perceive(blobs_to_process)
+        outputs = table.predict(slots, inputs)
+        noise = self.rng.uniform(-C.ACTION_NOISE, C.ACTION_NOISE, outputs.shape)
+        for blob, output, row in zip(blobs_to_process, outputs, noise):
+            if blob.slot >= 0:
+                blob.act(output, row)
+
+    def end_turn(self) -> None:
+        """Regrow food and close the turn once every blob has acted."""
+        grid = self.grid
+        if self.turn % 4 == 0 and self.turn != 0:
+            grid.reset_food()
+        if self.turn % (1000 // C.REPRODUCE_RATE) == 0 and self.turn != 0:
+            for blob in grid.list_blobs:
+                if blob.slot >= 0:
+                    blob.reproduce()
+        if self.turn % C.HALL_OF_FAME_EVERY == 0:
+            self.hall_of_fame.update(self)
+        self.turn += 1
+
+    def run(self, n_turns: int, stop_on_extinction: bool = True) -> int:
+        """Advance up to ``n_turns`` turns and return how many were played."""
+        for played in range(n_turns):
+            if stop_on_extinction and self.extinct:
+                return played
+            self.step()
+        return n_turns
+
+    def reset(self, reseed: bool = False) -> None:
+        """Start over on a fresh map; with ``reseed`` (and a non-empty hall of
+        fame) the new population is cloned from the hall of fame."""
+        if reseed and len(self.hall_of_fame):
+            self.grid.seed_brains = self.hall_of_fame.brains()
+        self.grid.reset_map()
+        self.turn = 0
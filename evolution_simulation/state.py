@@ -8,18 +8,29 @@ import pygame
 from . import constants as C
 
 if TYPE_CHECKING:
-    from .entities import Grid
+    from .entities import Brain
+    from .simulation import Simulation
     from .ui import ImageManager
+    from .worker import SimulationWorker
 
 
 @dataclass
 class AppState:
     # Dynamic simulation state
-    grid: Grid | None = None
-    turn: int = 0
+    sim: Simulation | None = None
+    # Steps ``sim`` on its own thread while a simulation is on screen
+    worker: SimulationWorker | None = None
     running: bool = True
     sim_running: bool = True
+    # Turbo: as many turns per frame as fit in the budget instead of target_fps
+    turbo: bool = False
+    turbo_budget_ms: float = C.TURBO_FRAME_BUDGET_MS
+    # Archived genomes new runs start from (random brains when empty)
+    seed_genomes: list[Brain] = field(default_factory=list)
     game_state: str = "menu"  # "menu" | "simulation"
+    # Message shown at the bottom of the window until the status_until tick
+    status: str = ""
+    status_until: int = 0
 
     # Dynamic parameters (can be changed via sliders)
     TAILLE_GRID: int = C.TAILLE_GRID
@@ -32,6 +43,7 @@ class AppState:
     SCAN_RANGE: int = C.SCAN_RANGE
 
     # View
+    render_mode: str = "auto"  # see render.RENDER_MODES
     CELL_SIZE: float = field(init=False)
     SCALE_X: float = 1.0
     SCALE_Y: float = 1.0
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .entities import Blob
+from .simulation import Simulation, SimulationParams
+
+# Parameters a sweep may vary, with their types
+SWEEP_PARAMS: dict[str, type] = {
+    name: type(value) for name, value in asdict(SimulationParams()).items()
+}
+METRICS: list[str] = [
+    "survival_turns",
+    "extinct",
+    "peak_population",
+    "final_population",
+    "mean_energy",
+    "turns_per_sec",
+]
+
+
+def grid_configs(space: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Every combination of the listed values."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_configs(
+    space: dict[str, tuple[float, float]], n: int, seed: int = 0
+) -> list[dict[str, Any]]:
+    """``n`` configurations drawn uniformly from the ``(low, high)`` ranges;
+    integer parameters are drawn as integers, bounds included."""
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        config: dict[str, Any] = {}
+        for name, (low, high) in space.items():
+            if SWEEP_PARAMS[name] is int:
+                config[name] = int(rng.integers(int(low), int(high) + 1))
+            else:
+                config[name] = float(rng.uniform(low, high))
+        configs.append(config)
+    return configs
+
+
+def run_one(config: dict[str, Any], seed: int, turns: int) -> dict[str, Any]:
+    """Play one headless run of up to ``turns`` turns and summarise it.
+
+    Runs in a worker process, so it resets that process's blob ids itself;
+    the run's generator is seeded with ``seed``, so the same
+    ``(config, seed)`` always gives the same run.
+    """
+    Blob.NEXT_ID = 1
+    sim = Simulation(SimulationParams(**config), rng=seed)
+    table = sim.grid.blobs
+    peak = sim.grid.population
+    energy_sum = 0.0
+    measured = 0
+    start = time.perf_counter()
+    while sim.turn < turns and not sim.extinct:
+        sim.step()
+        population = sim.grid.population
+        peak = max(peak, population)
+        if population:
+            energy_sum += table.totals["energy"] / population
+            measured += 1
+    elapsed = time.perf_counter() - start
+    return {
+        **config,
+        "seed": seed,
+        "survival_turns": sim.turn,
+        "extinct": sim.extinct,
+        "peak_population": peak,
+        "final_population": sim.grid.population,
+        "mean_energy": energy_sum / measured if measured else 0.0,
+        "turns_per_sec": sim.turn / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_sweep(
+    configs: list[dict[str, Any]],
+    seeds: int,
+    turns: int,
+    out: str | Path,
+    workers: int | None = None,
+) -> int:
+    """Run every configuration with seeds ``0..seeds-1`` on a process pool.
+
+    A CSV row is appended to ``out`` (and flushed) as each run finishes, so
+    a long sweep can be watched or interrupted without losing results. A run
+    that raises gets a row with its parameters, seed and the error instead,
+    and the others carry on. Returns the number of runs written.
+    """
+    columns = sorted({name for config in configs for name in config})
+    header = columns + ["seed"] + METRICS + ["error"]
+    written = 0
+    with open(out, "w", newline="") as file, ProcessPoolExecutor(workers) as pool:
+        writer = csv.DictWriter(file, fieldnames=header, restval="")
+        writer.writeheader()
+        file.flush()
+        futures = {
+            pool.submit(run_one, config, seed, turns): (config, seed)
+            for config in configs
+            for seed in range(seeds)
+        }
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as error:
+                config, seed = futures[future]
+                row = {**config, "seed": seed, "error": repr(error)}
+            writer.writerow(row)
+            file.flush()
+            written += 1
+    return written
+
+
+def parse_space(specs: list[str], ranges: bool) -> dict[str, Any]:
+    """Turn ``NAME=v1,v2,...`` (or ``NAME=low:high`` with ``ranges``) into
+    a search space."""
+    space: dict[str, Any] = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in SWEEP_PARAMS:
+            raise ValueError(f"unknown parameter {name!r}")
+        kind = SWEEP_PARAMS[name]
+        if ranges:
+            low, _, high = values.partition(":")
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [kind(float(value)) for value in values.split(",")]
+    return space
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run headless simulations over a parameter grid or a "
+        "random search, in parallel, streaming one CSV row per run."
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUES",
+        help="values to sweep, e.g. MUTATION_RATE=0.05,0.1 "
+        "(NAME=LOW:HIGH with --random)",
+    )
+    parser.add_argument(
+        "--random", type=int, metavar="N", help="draw N random configurations"
+    )
+    parser.add_argument("--seeds", type=int, default=3, help="runs per config")
+    parser.add_argument("--turns", type=int, default=2000, help="turn cap per run")
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--search-seed", type=int, default=0)
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args(argv)
+    if args.random:
+        configs = random_configs(
+            parse_space(args.param, ranges=True), args.random, args.search_seed
+        )
+    else:
+        configs = grid_configs(parse_space(args.param, ranges=False))
+    start = time.perf_counter()
+    runs = run_sweep(configs, args.seeds, args.turns, args.out, args.workers)
+    print(f"{runs} runs in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import time
+from dataclasses import asdict
+from multiprocessing.connection import Connection
+from typing import Any, Tuple
+
+import numpy as np
+
+from . import constants as C
+from .entities import BRAIN_LAYERS, Blob, Brain
+from .simulation import Simulation, SimulationParams
+from .utils import diamond_offsets
+
+# (x0, y0, x1, y1), end excluded
+Rect = Tuple[int, int, int, int]
+
+# Blob ids of tile k start at k * ID_STRIDE + 1 so they stay unique world-wide
+ID_STRIDE: int = 1 << 40
+# A blob as seen by the tiles mirroring it, in world coordinates
+GHOST_DTYPE = np.dtype(
+    [
+        ("x", np.int32),
+        ("y", np.int32),
+        ("id", np.int64),
+        ("parents", np.int64, (2,)),
+        ("energy", np.int32),
+        ("offspring", np.int32),
+    ]
+)
+# What a tile did to another tile's blob during a turn
+DELTA_DTYPE = np.dtype(
+    [("id", np.int64), ("energy", np.int32), ("offspring", np.int32)]
+)
+# Ghosts never act, and a blob only ever mates with the blob on its own cell,
+# so their brains are never read
+GHOST_WEIGHTS: list[np.ndarray] = [np.zeros(shape) for shape in BRAIN_LAYERS]
+
+
+def halo_width(params: SimulationParams) -> int:
+    """How far into its neighbours a tile must see: the reach of the scans,
+    the density quadrants and child placement."""
+    return max(params.SCAN_RANGE, C.DENSITY_SCAN_RANGE, C.REPRODUCE_DISTANCE)
+
+
+def tile_bounds(size: int, rows: int, cols: int) -> list[Rect]:
+    """``rows`` x ``cols`` near-equal tiles covering a ``size`` square world,
+    row-major."""
+    xs = np.linspace(0, size, rows + 1).round().astype(int).tolist()
+    ys = np.linspace(0, size, cols + 1).round().astype(int).tolist()
+    return [
+        (xs[i], ys[j], xs[i + 1], ys[j + 1]) for i in range(rows) for j in range(cols)
+    ]
+
+
+def grow(rect: Rect, margin: int, size: int) -> Rect:
+    x0, y0, x1, y1 = rect
+    return (
+        max(x0 - margin, 0),
+        max(y0 - margin, 0),
+        min(x1 + margin, size),
+        min(y1 + margin, size),
+    )
+
+
+def intersect(a: Rect, b: Rect) -> Rect | None:
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+
+class Tile:
+    """The part of a tiled world stepped by one process.
+
+    The tile owns the food and blobs of ``bounds`` and mirrors a halo of
+    ``halo_width`` cells from its neighbours, so its local ``Simulation``
+    covers the bounds plus the halo (clipped to the world) and local
+    coordinates are world ones minus ``origin``. Each ``step`` is one turn:
+
+    1. every tile sends the food and blobs its neighbours mirror; mirrored
+       blobs become ghosts, which are perceived, hit and eaten around like
+       any blob but never act;
+    2. the owned blobs play the turn exactly as in ``Simulation.step``;
+    3. food taken from the halo and damage dealt to ghosts are sent to
+       their owners, and blobs that stepped or were born outside the bounds
+       migrate to the tile owning their cell;
+    4. food regrows on the owned cells only.
+
+    Within a turn neighbours do not see each other's moves, so close to a
+    border two blobs may eat the same food, or two tiles may send a blob to
+    the same cell; the later one then lands on the nearest free owned cell
+    (and is lost if there is none within the halo). Damage to a blob that
+    meanwhile migrated to a third tile is lost too.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        tiles: list[Rect],
+        params: SimulationParams,
+        inboxes: list[Any],
+        rng: np.random.Generator | None = None,
+    ) -> None:
+        self.index = index
+        self.bounds = tiles[index]
+        size = params.TAILLE_GRID
+        halo = halo_width(params)
+        window = grow(self.bounds, halo, size)
+        self.origin = window[:2]
+        self.sim = Simulation(
+            params,
+            populate=False,
+            shape=(window[2] - window[0], window[3] - window[1]),
+            rng=rng,
+        )
+        self.sim.grid.region = self.local(self.bounds)
+        # Per neighbour: the cells of its we mirror, and of ours it mirrors
+        self.mirrors: dict[int, Rect] = {}
+        self.shares: dict[int, Rect] = {}
+        for other, rect in enumerate(tiles):
+            mirrored = intersect(rect, window)
+            if other == index or mirrored is None:
+                continue
+            shared = intersect(self.bounds, grow(rect, halo, size))
+            assert shared is not None
+            self.mirrors[other] = mirrored
+            self.shares[other] = shared
+        self.inbox = inboxes[index]
+        self.outboxes = {other: inboxes[other] for other in self.mirrors}
+        # Messages of a phase a neighbour reached before we did
+        self.pending: dict[tuple[int, str], dict[int, Any]] = {}
+        self.ghosts: list[tuple[Blob, int, np.void]] = []
+        self.halo_food: dict[int, np.ndarray] = {}
+
+    def local(self, rect: Rect) -> Rect:
+        ox, oy = self.origin
+        return (rect[0] - ox, rect[1] - oy, rect[2] - ox, rect[3] - oy)
+
+    def owns(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Which local cells (xs, ys) lie inside the bounds."""
+        x0, y0, x1, y1 = self.sim.grid.region
+        return (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+
+    def owner_of(self, x: int, y: int) -> int:
+        """Neighbour owning the world cell (x, y) of the halo."""
+        for other, (x0, y0, x1, y1) in self.mirrors.items():
+            if x0 <= x < x1 and y0 <= y < y1:
+                return other
+        raise ValueError(f"cell ({x}, {y}) is outside the halo of tile {self.index}")
+
+    def exchange(self, phase: str, payloads: dict[int, Any]) -> list[tuple[int, Any]]:
+        """Send ``payloads[n]`` to every neighbour ``n`` and wait for theirs;
+        returns ``(neighbour, payload)`` pairs in neighbour order."""
+        key = (self.sim.turn, phase)
+        for other, payload in payloads.items():
+            self.outboxes[other].put((key, self.index, payload))
+        received = self.pending.pop(key, {})
+        while len(received) < len(self.outboxes):
+            got, sender, payload = self.inbox.get()
+            if got == key:
+                received[sender] = payload
+            else:
+                self.pending.setdefault(got, {})[sender] = payload
+        return sorted(received.items())
+
+    def blob_records(self, rect: Rect) -> np.ndarray:
+        """``GHOST_DTYPE`` records of the blobs standing in the world
+        ``rect``."""
+        grid = self.sim.grid
+        table = grid.blobs
+        x0, y0, x1, y1 = self.local(rect)
+        slots = grid.occupancy[x0:x1, y0:y1]
+        slots = slots[slots >= 0]
+        blobs = [table.objects[slot] for slot in slots.tolist()]
+        records = np.zeros(len(slots), dtype=GHOST_DTYPE)
+        records["x"] = table.x[slots] + self.origin[0]
+        records["y"] = table.y[slots] + self.origin[1]
+        records["id"] = [blob.id for blob in blobs if blob]
+        records["parents"] = np.array(
+            [blob.parent_ids or (0, 0) for blob in blobs if blob], dtype=np.int64
+        ).reshape(len(slots), 2)
+        records["energy"] = table.energy[slots]
+        records["offspring"] = table.offspring[slots]
+        return records
+
+    def step(self) -> None:
+        self.mirror_halo()
+        grid = self.sim.grid
+        table = grid.blobs
+        slots = table.live_slots()
+        self.sim.play(slots[self.owns(table.x[slots], table.y[slots])])
+        self.settle_effects()
+        self.sim.end_turn()
+
+    def mirror_halo(self) -> None:
+        grid = self.sim.grid
+        payloads = {}
+        for other, rect in self.shares.items():
+            x0, y0, x1, y1 = self.local(rect)
+            payloads[other] = (grid.food[x0:x1, y0:y1].copy(), self.blob_records(rect))
+        ox, oy = self.origin
+        next_id = Blob.NEXT_ID
+        for other, (food, ghosts) in self.exchange("halo", payloads):
+            x0, y0, x1, y1 = self.local(self.mirrors[other])
+            # Only changed cells, so the food counters and field stay in step
+            changed = np.argwhere(grid.food[x0:x1, y0:y1] != food)
+            for i, j in changed.tolist():
+                if food[i, j]:
+                    grid.place_food(x0 + i, y0 + j, int(food[i, j]))
+                else:
+                    grid.remove_food(x0 + i, y0 + j)
+            self.halo_food[other] = food
+            for record in ghosts:
+                ghost = Blob(
+                    int(record["x"]) - ox,
+                    int(record["y"]) - oy,
+                    int(record["energy"]),
+                    grid=grid,
+                    brain=Brain.from_weights(GHOST_WEIGHTS, copy=False),
+                )
+                ghost.id = int(record["id"])
+                grid.blobs.offer_leader(ghost.slot)
+                parents = record["parents"].tolist()
+                ghost.parent_ids = (parents[0], parents[1]) if any(parents) else ()
+                ghost.offspring = int(record["offspring"])
+                grid.place_blob(ghost)
+                self.ghosts.append((ghost, other, record))
+        Blob.NEXT_ID = next_id
+
+    def settle_effects(self) -> None:
+        grid = self.sim.grid
+        table = grid.blobs
+        eaten: dict[int, np.ndarray] = {}
+        deltas: dict[int, list[tuple[int, int, int]]] = {n: [] for n in self.mirrors}
+        migrants: dict[int, list[dict[str, Any]]] = {n: [] for n in self.mirrors}
+        for other, food in self.halo_food.items():
+            x0, y0, x1, y1 = self.local(self.mirrors[other])
+            cells = np.argwhere((food > 0) & (grid.food[x0:x1, y0:y1] == 0))
+            eaten[other] = cells + self.mirrors[other][:2]
+        for ghost, owner, record in self.ghosts:
+            energy = ghost.energy - int(record["energy"])
+            offspring = ghost.offspring - int(record["offspring"])
+            if energy or offspring:
+                deltas[owner].append((int(record["id"]), energy, offspring))
+            ghost.suicide()
+        self.ghosts = []
+        slots = table.live_slots()
+        away = slots[~self.owns(table.x[slots], table.y[slots])]
+        for slot in away.tolist():
+            blob = table.objects[slot]
+            assert blob is not None
+            # Migrants travel with world coordinates
+            state = blob.state()
+            state["x"] += self.origin[0]
+            state["y"] += self.origin[1]
+            migrants[self.owner_of(state["x"], state["y"])].append(state)
+            grid.remove_blob(blob)
+        payloads = {
+            other: (
+                eaten.get(other, np.zeros((0, 2), dtype=np.intp)),
+                np.array(deltas[other], dtype=DELTA_DTYPE),
+                migrants[other],
+            )
+            for other in self.mirrors
+        }
+        received = self.exchange("effects", payloads)
+        ox, oy = self.origin
+        # Immigrants first, so damage dealt to a blob that just crossed the
+        # border still lands
+        for _, (_, _, arrivals) in received:
+            for state in arrivals:
+                self.settle(state)
+        for _, (cells, _, _) in received:
+            for x, y in cells.tolist():
+                grid.remove_food(x - ox, y - oy)
+        hits = [delta for _, (_, batch, _) in received for delta in batch.tolist()]
+        if hits:
+            by_id = {blob.id: blob for blob in table.live_blobs()}
+            for blob_id, energy, offspring in hits:
+                target = by_id.get(blob_id)
+                if target is None or target.slot < 0:
+                    continue
+                target.energy += energy
+                target.offspring += offspring
+                if target.energy <= 0:
+                    target.suicide()
+
+    def settle(self, state: dict[str, Any]) -> None:
+        """Place an immigrant on its cell, or on the nearest free owned cell
+        when another blob got there first."""
+        grid = self.sim.grid
+        x, y = state["x"] - self.origin[0], state["y"] - self.origin[1]
+        if grid.occupancy[x, y] >= 0:
+            offsets = diamond_offsets(halo_width(self.sim.params))
+            xs, ys = offsets.dx + x, offsets.dy + y
+            inside = self.owns(xs, ys)
+            xs, ys = xs[inside], ys[inside]
+            free = np.flatnonzero(grid.occupancy[xs, ys] < 0)
+            if not free.size:
+                return
+            x, y = int(xs[free[0]]), int(ys[free[0]])
+        next_id = Blob.NEXT_ID
+        Blob.from_state(grid, state, x, y)
+        Blob.NEXT_ID = next_id
+
+    def stats(self) -> dict[str, Any]:
+        grid = self.sim.grid
+        x0, y0, x1, y1 = grid.region
+        return {
+            "turn": self.sim.turn,
+            "population": grid.population,
+            "energy_total": int(grid.blobs.totals["energy"]),
+            "food_count": int(np.count_nonzero(grid.food[x0:x1, y0:y1])),
+        }
+
+    def gather(self) -> tuple[Rect, np.ndarray, np.ndarray]:
+        """The bounds, their food and ``GHOST_DTYPE`` records of the owned
+        blobs, e.g. to draw or check the whole world."""
+        x0, y0, x1, y1 = self.sim.grid.region
+        food = self.sim.grid.food[x0:x1, y0:y1].copy()
+        return self.bounds, food, self.blob_records(self.bounds)
+
+
+def tile_main(
+    conn: Connection,
+    index: int,
+    tiles: list[Rect],
+    params: dict[str, Any],
+    rng: np.random.Generator,
+    inboxes: list[Any],
+) -> None:
+    """Body of one tile process: play turns on request until told to stop.
+
+    Requests are ``("run", turns)``, answered with the tile's stats, and
+    ``("gather", None)``, answered with ``Tile.gather()``.
+    """
+    Blob.NEXT_ID = index * ID_STRIDE + 1
+    tile = Tile(index, tiles, SimulationParams(**params), inboxes, rng)
+    tile.sim.grid.populate()
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        command, value = request
+        if command == "run":
+            start = time.perf_counter()
+            for _ in range(value):
+                tile.step()
+            conn.send({**tile.stats(), "seconds": time.perf_counter() - start})
+        elif command == "gather":
+            conn.send(tile.gather())
+        else:
+            raise ValueError(f"unknown tile command {command!r}")
+    conn.close()
+
+
+class TiledWorld:
+    """One ``TAILLE_GRID`` square world split into ``rows`` x ``cols`` tiles,
+    each stepped by its own process (see ``Tile``).
+
+    Blobs keep the rules of ``Simulation``: one per cell, no wrapping at the
+    world's edges. Tiles only talk to the neighbours within a halo of each
+    other, twice per turn, through one queue per tile, so the turns of all
+    tiles advance in lockstep.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        params: SimulationParams | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.params = params or SimulationParams()
+        size = self.params.TAILLE_GRID
+        if rows > size or cols > size:
+            raise ValueError(f"cannot split a {size} grid into {rows}x{cols} tiles")
+        self.tiles = tile_bounds(size, rows, cols)
+        self.turn = 0
+        settings = asdict(self.params)
+        inboxes: list[Any] = [mp.Queue() for _ in self.tiles]
+        streams = [
+            np.random.default_rng(child)
+            for child in np.random.SeedSequence(seed).spawn(len(self.tiles))
+        ]
+        self.connections: list[Connection] = []
+        self.processes: list[mp.Process] = []
+        for index in range(len(self.tiles)):
+            parent, child = mp.Pipe()
+            process = mp.Process(
+                target=tile_main,
+                args=(child, index, self.tiles, settings, streams[index], inboxes),
+                name=f"tile-{index}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def run(self, turns: int) -> list[dict[str, Any]]:
+        """Play ``turns`` turns on every tile; returns each tile's stats."""
+        for conn in self.connections:
+            conn.send(("run", turns))
+        stats = [conn.recv() for conn in self.connections]
+        self.turn += turns
+        return stats
+
+    def gather(self) -> tuple[np.ndarray, np.ndarray]:
+        """The whole world's food grid and ``GHOST_DTYPE`` records of all
+        its blobs."""
+        for conn in self.connections:
+            conn.send(("gather", None))
+        size = self.params.TAILLE_GRID
+        food = np.zeros((size, size), dtype=np.int16)
+        blobs = []
+        for conn in self.connections:
+            (x0, y0, x1, y1), tile_food, records = conn.recv()
+            food[x0:x1, y0:y1] = tile_food
+            blobs.append(records)
+        return food, np.concatenate(blobs)
+
+    def close(self) -> None:
+        for conn in self.connections:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+
+    def __enter__(self) -> TiledWorld:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Step one large world split into tiles, one process each."
+    )
+    parser.add_argument("--tiles", default="2x2", help="ROWSxCOLS")
+    parser.add_argument("--grid", type=int, default=SimulationParams().TAILLE_GRID)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--report", type=int, default=50, help="turns per report")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rows, _, cols = args.tiles.partition("x")
+    params = SimulationParams(TAILLE_GRID=args.grid)
+    start = time.perf_counter()
+    with TiledWorld(int(rows), int(cols or rows), params, args.seed) as world:
+        while world.turn < args.turns:
+            started = time.perf_counter()
+            turns = min(args.report, args.turns - world.turn)
+            stats = world.run(turns)
+            elapsed = time.perf_counter() - started
+            population = sum(s["population"] for s in stats)
+            print(
+                f"turn {world.turn}: population {population}, "
+                f"food {sum(s['food_count'] for s in stats)}, "
+                f"{turns / elapsed:.1f} turns/s"
+            )
+            if not population:
+                break
+    print(f"{world.turn} turns in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
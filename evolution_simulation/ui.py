@@ -1,18 +1,98 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 import pygame
 
 from . import constants as C
+from .entities import ACTION_NAMES
 from .state import state
 
+if TYPE_CHECKING:
+    from .worker import Snapshot
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> pygame.font.Font:
+    """The UI font at ``size``, created once per size."""
+    return pygame.font.SysFont("comicsans", size)
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, colour).
+
+    Labels, titles and slowly changing values are rasterized once and then
+    only blitted; rarely seen strings fall out after ``maxsize`` entries.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.surfaces: OrderedDict[
+            tuple[pygame.font.Font, str, tuple[int, int, int]], pygame.Surface
+        ] = OrderedDict()
+
+    def render(
+        self, font: pygame.font.Font, text: str, color: tuple[int, int, int]
+    ) -> pygame.Surface:
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.maxsize:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+text_cache = TextCache()
+
+
+def render_text(
+    font: pygame.font.Font, text: str, color: tuple[int, int, int]
+) -> pygame.Surface:
+    return text_cache.render(font, text, color)
+
+
+def show_status(text: str) -> None:
+    """Show ``text`` at the bottom of the window for a few seconds."""
+    state.status = text
+    state.status_until = pygame.time.get_ticks() + C.STATUS_MESSAGE_MS
+
+
+def draw_status(surface: pygame.Surface) -> None:
+    if not state.status or not state.FONT:
+        return
+    if pygame.time.get_ticks() >= state.status_until:
+        state.status = ""
+        return
+    rendered = render_text(state.FONT, state.status, C.COLOR["ORANGE"])
+    padding = 6
+    y = surface.get_height() - rendered.get_height() - padding
+    pygame.draw.rect(
+        surface,
+        (30, 30, 30),
+        (0, y - padding, rendered.get_width() + 2 * padding, surface.get_height()),
+    )
+    surface.blit(rendered, (padding, y))
+
 
 class ImageManager:
+    # Tints are rounded to multiples of this step per channel before caching
+    TINT_STEP: int = 4
+
     def __init__(self) -> None:
         self.blob_image: pygame.Surface | None = None
         self.food_image: pygame.Surface | None = None
         self.blob_original: pygame.Surface | None = None
         self.food_original: pygame.Surface | None = None
         self.last_cell_size: int = -1
+        # Blob sprite multiplied by a colour, per quantized colour at the
+        # current cell size; emptied whenever the sprites are rescaled
+        self.tinted: dict[tuple[int, int, int], pygame.Surface] = {}
         self.load_images()
 
     def load_images(self) -> None:
@@ -29,6 +109,7 @@ class ImageManager:
             target = max(1, int(cell_size))
             if target == self.last_cell_size:
                 return
+            self.tinted.clear()
             if self.blob_original is not None:
                 self.blob_image = pygame.transform.scale(
                     self.blob_original, (target, target)
@@ -41,6 +122,20 @@ class ImageManager:
         except Exception:
             pass
 
+    def tinted_blob(self, color: tuple[int, int, int]) -> pygame.Surface | None:
+        """The blob sprite tinted with ``color``, built once per colour."""
+        if self.blob_image is None:
+            return None
+        step = self.TINT_STEP
+        r, g, b = (min(255, (c + step // 2) // step * step) for c in color)
+        key = (r, g, b)
+        sprite = self.tinted.get(key)
+        if sprite is None:
+            sprite = self.blob_image.copy()
+            sprite.fill(key, special_flags=pygame.BLEND_MULT)
+            self.tinted[key] = sprite
+        return sprite
+
 
 class ParameterSlider:
     def __init__(
@@ -118,12 +213,12 @@ class ParameterSlider:
         pygame.draw.rect(surface, C.COLOR["GREEN"], self.slider_rect)
         if not state.FONT_PETIT or not state.FONT:
             return
-        text = state.FONT_PETIT.render(
-            f"{self.name}: {self.current_val}", True, C.COLOR["WHITE"]
+        text = render_text(
+            state.FONT_PETIT, f"{self.name}: {self.current_val}", C.COLOR["WHITE"]
         )
         surface.blit(text, (self.x, self.y - 30))
-        min_text = state.FONT_PETIT.render(str(self.min_val), True, C.COLOR["WHITE"])
-        max_text = state.FONT_PETIT.render(str(self.max_val), True, C.COLOR["WHITE"])
+        min_text = render_text(state.FONT_PETIT, str(self.min_val), C.COLOR["WHITE"])
+        max_text = render_text(state.FONT_PETIT, str(self.max_val), C.COLOR["WHITE"])
         surface.blit(min_text, (self.x, self.y + self.height + 10))
         surface.blit(max_text, (self.x + self.width - 40, self.y + self.height + 10))
 
@@ -233,9 +328,9 @@ class StartMenu:
             return
         scale_x = state.SCALE_X or 1.0
         scale_y = state.SCALE_Y or 1.0
-        title = state.FONT_GRAND.render("EVOLUTION SIMULATION", True, C.COLOR["CYAN"])
+        title = render_text(state.FONT_GRAND, "EVOLUTION SIMULATION", C.COLOR["CYAN"])
         surface.blit(title, (int((C.WIDTH // 2 - 150) * scale_x), int(30 * scale_y)))
-        subtitle = state.FONT.render("Parameters", True, C.COLOR["WHITE"])
+        subtitle = render_text(state.FONT, "Parameters", C.COLOR["WHITE"])
         surface.blit(subtitle, (int((C.WIDTH // 2 - 70) * scale_x), int(60 * scale_y)))
         current_y = int(140 * scale_y)
         for key in self.slider_keys:
@@ -257,7 +352,7 @@ class StartMenu:
         pygame.draw.rect(surface, C.COLOR["GREEN"], self.start_button_rect)
         pygame.draw.rect(surface, C.COLOR["WHITE"], self.start_button_rect, 2)
         start_text = (
-            state.FONT_GRAND.render("START", True, C.COLOR["BLACK"])
+            render_text(state.FONT_GRAND, "START", C.COLOR["BLACK"])
             if state.FONT_GRAND
             else None
         )
@@ -308,7 +403,7 @@ class BackToMenuButton:
         ]
         pygame.draw.polygon(surface, C.COLOR["ORANGE"], points)
         if state.FONT_PETIT:
-            text_surface = state.FONT_PETIT.render("MENU", True, C.COLOR["WHITE"])
+            text_surface = render_text(state.FONT_PETIT, "MENU", C.COLOR["WHITE"])
             text_rect = text_surface.get_rect(
                 center=(center_x, center_y + int(25 * scale_y))
             )
@@ -347,7 +442,7 @@ class PauseButton:
         pygame.draw.rect(surface, C.COLOR["WHITE"], scaled_rect, 2)
         label = "PAUSE" if is_running else "RUN"
         if state.FONT:
-            text_surface = state.FONT.render(label, True, C.COLOR["BLACK"])
+            text_surface = render_text(state.FONT, label, C.COLOR["BLACK"])
             text_rect = text_surface.get_rect(center=scaled_rect.center)
             surface.blit(text_surface, text_rect)
 
@@ -417,15 +512,15 @@ class FPSSlider:
         pygame.draw.rect(surface, C.COLOR["DARK_GREY"], bg_rect)
         pygame.draw.rect(surface, C.COLOR["GREEN"], knob_rect)
         if state.FONT_PETIT:
-            text = state.FONT_PETIT.render(
-                f"FPS: {self.current_fps}", True, C.COLOR["WHITE"]
+            text = render_text(
+                state.FONT_PETIT, f"FPS: {self.current_fps}", C.COLOR["WHITE"]
             )
             surface.blit(text, (bg_rect.x, bg_rect.y - 20))
-            min_text = state.FONT_PETIT.render(
-                str(self.min_fps), True, C.COLOR["WHITE"]
+            min_text = render_text(
+                state.FONT_PETIT, str(self.min_fps), C.COLOR["WHITE"]
             )
-            max_text = state.FONT_PETIT.render(
-                str(self.max_fps), True, C.COLOR["WHITE"]
+            max_text = render_text(
+                state.FONT_PETIT, str(self.max_fps), C.COLOR["WHITE"]
             )
             surface.blit(min_text, (bg_rect.x, bg_rect.y + bg_rect.height + 5))
             surface.blit(
@@ -447,32 +542,28 @@ class LightweightMonitor:
         self.energy_stats: dict[str, int] = {"min": 0, "max": 0, "avg": 0}
         self.population_history: list[int] = []
         self.food_count = 0
-
-    def update_stats(self, blobs: list, grid_obj: object) -> None:
-        if not blobs:
+        self.turn = 0
+        self.population = 0
+        self.turn_rate = 0.0
+
+    def update_stats(self, snapshot: Snapshot) -> None:
+        """Refresh from a snapshot's running counters; nothing here walks the
+        population or the cells except the vectorized energy min/max."""
+        self.turn = snapshot.turn
+        self.turn_rate = snapshot.turn_rate
+        self.population = population = snapshot.population
+        if not population:
             return
-        energies = [blob.energy for blob in blobs]
         self.energy_stats = {
-            "min": min(energies),
-            "max": max(energies),
-            "avg": sum(energies) // len(energies),
+            "min": int(snapshot.energy.min()),
+            "max": int(snapshot.energy.max()),
+            "avg": snapshot.energy_total // population,
         }
-        self.behaviour_counts = {k: 0 for k in self.behaviour_counts}
-        for blob in blobs:
-            if blob.behaviour:
-                last_behaviour = blob.behaviour[-1]
-                if last_behaviour in self.behaviour_counts:
-                    self.behaviour_counts[last_behaviour] += 1
-        self.food_count = 0
-        if hasattr(grid_obj, "grid"):
-            from .entities import Food  # local import to avoid cycles
-
-            for i in range(state.TAILLE_GRID):
-                for j in range(state.TAILLE_GRID):
-                    for entity in grid_obj.grid[i][j]:
-                        if isinstance(entity, Food):
-                            self.food_count += 1
-        self.population_history.append(len(blobs))
+        for action, count in zip(ACTION_NAMES, snapshot.action_counts.tolist()):
+            if action in self.behaviour_counts:
+                self.behaviour_counts[action] = count
+        self.food_count = snapshot.food_count
+        self.population_history.append(population)
         if len(self.population_history) > 50:
             self.population_history.pop(0)
 
@@ -483,29 +574,30 @@ class LightweightMonitor:
         scale_y = state.SCALE_Y or 1.0
         sx = int(x * scale_x)
         sy = int(y * scale_y)
-        title = state.FONT_GRAND.render("SIMULATION MONITOR", True, C.COLOR["CYAN"])
+        title = render_text(state.FONT_GRAND, "SIMULATION MONITOR", C.COLOR["CYAN"])
         surface.blit(title, (sx, sy))
         sy += int(30 * scale_y)
         stats_text = [
-            f"Turn: {state.turn}",
-            f"Blobs alive: {len(state.grid.list_blobs) if state.grid else 0}",
+            f"Turn: {self.turn}",
+            f"Blobs alive: {self.population}",
             f"Food: {self.food_count}",
+            f"Turns/s: {self.turn_rate:.0f}" + (" (turbo)" if state.turbo else ""),
             f"Target FPS: {state.target_fps}",
             f"Current FPS: {state.current_fps:.1f}",
         ]
         for i, text in enumerate(stats_text):
             color = C.COLOR["WHITE"] if i < 3 else C.COLOR["ORANGE"]
-            rendered = state.FONT.render(text, True, color)
+            rendered = render_text(state.FONT, text, color)
             surface.blit(rendered, (sx, sy + int(i * 20 * scale_y)))
-        sy += int(120 * scale_y)
-        energy_title = state.FONT.render("ENERGY", True, C.COLOR["GREEN"])
+        sy += int(140 * scale_y)
+        energy_title = render_text(state.FONT, "ENERGY", C.COLOR["GREEN"])
         surface.blit(energy_title, (sx, sy))
         sy += int(25 * scale_y)
         for key in ["min", "max", "avg"]:
             rendered = (
-                state.FONT_PETIT.render(
+                render_text(
+                    state.FONT_PETIT,
                     f"{key.capitalize()}: {self.energy_stats[key]}",
-                    True,
                     C.COLOR["WHITE"],
                 )
                 if state.FONT_PETIT
@@ -515,19 +607,19 @@ class LightweightMonitor:
                 surface.blit(rendered, (sx, sy))
                 sy += int(18 * scale_y)
         sy += int(10 * scale_y)
-        behaviour_title = state.FONT.render("BEHAVIOURS", True, C.COLOR["PURPLE"])
+        behaviour_title = render_text(state.FONT, "BEHAVIOURS", C.COLOR["PURPLE"])
         surface.blit(behaviour_title, (sx, sy))
         sy += int(25 * scale_y)
         for behaviour, count in self.behaviour_counts.items():
             if count > 0 and state.FONT_PETIT:
                 text = f"{behaviour}: {count}"
                 color = C.COLOR["YELLOW"] if count > 10 else C.COLOR["WHITE"]
-                rendered = state.FONT_PETIT.render(text, True, color)
+                rendered = render_text(state.FONT_PETIT, text, color)
                 surface.blit(rendered, (sx, sy))
                 sy += int(18 * scale_y)
         sy += int(20 * scale_y)
-        if self.population_history and state.FONT and state.grid is not None:
-            pop_title = state.FONT.render("POPULATION", True, C.COLOR["BLUE"])
+        if self.population_history and state.FONT:
+            pop_title = render_text(state.FONT, "POPULATION", C.COLOR["BLUE"])
             surface.blit(pop_title, (sx, sy))
             sy += int(25 * scale_y)
             graph_width = int(200 * scale_x)
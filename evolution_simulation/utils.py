@@ -1,41 +1,138 @@
-from typing import Any, List, Type
+from __future__ import annotations
 
+from functools import lru_cache
+from typing import NamedTuple
 
-def calculate_type_density(
-    grid: List[List[Any]],
-    x: int,
-    y: int,
-    direction: str,
-    scan_range: int,
-    entity_type: Type,
-) -> float:
-    """Calculate the density of a specific entity type in a given direction.
+import numpy as np
 
-    Optimized to avoid repeated bound checks and expensive operations.
+
+def sample_cells(
+    shape: tuple[int, int], rate: float, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cells of a grid of ``shape`` each picked with probability ``rate``.
+
+    Same distribution as one Bernoulli draw per cell, but the number of picks
+    is drawn from a binomial and only that many distinct cells are sampled,
+    so the cost follows the number of picks rather than the grid area.
+    Cells come back in row-major order.
+    """
+    n_cells = shape[0] * shape[1]
+    count = int(rng.binomial(n_cells, min(max(rate, 0.0), 1.0)))
+    picked = np.sort(rng.choice(n_cells, count, replace=False)).astype(np.intp)
+    xs, ys = np.divmod(picked, shape[1])
+    return xs, ys
+
+
+def summed_area_table(mask: np.ndarray) -> np.ndarray:
+    """Integral image of ``mask`` padded with a leading row and column of zeros.
+
+    ``sat[i, j]`` is the number of set cells in ``mask[:i, :j]``, so any
+    rectangle can be counted with four lookups.
     """
-    count = 0
-    total_cells = 0
-
-    if direction == "NE":
-        x_range = range(x + 1, min(x + scan_range + 1, len(grid)))
-        y_range = range(max(y - scan_range, 0), y)
-    elif direction == "NW":
-        x_range = range(max(x - scan_range, 0), x)
-        y_range = range(max(y - scan_range, 0), y)
-    elif direction == "SE":
-        x_range = range(x + 1, min(x + scan_range + 1, len(grid)))
-        y_range = range(y + 1, min(y + scan_range + 1, len(grid[0])))
-    elif direction == "SW":
-        x_range = range(max(x - scan_range, 0), x)
-        y_range = range(y + 1, min(y + scan_range + 1, len(grid[0])))
-    else:
-        return 0.0
-
-    for i in x_range:
-        for j in y_range:
-            if 0 <= i < len(grid) and 0 <= j < len(grid[0]) and grid[i][j]:
-                if isinstance(grid[i][j][0], entity_type):
-                    count += 1
-            total_cells += 1
-
-    return count / max(total_cells, 1)
+    sat = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=np.int32)
+    np.cumsum(mask, axis=0, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def quadrant_densities(
+    sat: np.ndarray, xs: np.ndarray, ys: np.ndarray, scan_range: int
+) -> np.ndarray:
+    """Share of set cells in the four quadrants around each position.
+
+    Each quadrant spans ``scan_range`` cells on both axes, excluding the
+    position's own row and column, and is clipped to the grid. Returns an
+    ``(len(xs), 4)`` array with the NE, NW, SE and SW shares of the mask
+    ``sat`` was built from, 0 for quadrants clipped away entirely.
+    """
+    size_x, size_y = sat.shape[0] - 1, sat.shape[1] - 1
+    west = (np.maximum(xs - scan_range, 0), xs)
+    east = (xs + 1, np.minimum(xs + scan_range + 1, size_x))
+    north = (np.maximum(ys - scan_range, 0), ys)
+    south = (ys + 1, np.minimum(ys + scan_range + 1, size_y))
+    densities = np.empty((len(xs), 4))
+    quadrants = [(east, north), (west, north), (east, south), (west, south)]
+    for k, ((x0, x1), (y0, y1)) in enumerate(quadrants):
+        count = sat[x1, y1] - sat[x0, y1] - sat[x1, y0] + sat[x0, y0]
+        total = (x1 - x0) * (y1 - y0)
+        densities[:, k] = np.where(total > 0, count / np.maximum(total, 1), 0.0)
+    return densities
+
+
+class DiamondOffsets(NamedTuple):
+    """Cell offsets within a Manhattan radius, sorted by distance.
+
+    Ties keep the row-major ``(dx, dy)`` order of the original square scans.
+    ``stages`` splits the table at ring boundaries into chunks of doubling
+    width, so nearest queries can stop after the first chunk with a match.
+    """
+
+    dx: np.ndarray
+    dy: np.ndarray
+    dist: np.ndarray
+    stages: tuple[tuple[int, int], ...]
+
+
+@lru_cache(maxsize=None)
+def diamond_offsets(radius: int) -> DiamondOffsets:
+    radius = max(radius, 0)
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span, indexing="ij")
+    dist = np.abs(dx) + np.abs(dy)
+    inside = dist <= radius
+    dx, dy, dist = dx[inside], dy[inside], dist[inside]
+    order = np.argsort(dist, kind="stable")
+    dx, dy, dist = dx[order], dy[order], dist[order]
+    # ring_end[d] is the number of offsets at distance <= d
+    ring_end = np.cumsum(np.bincount(dist, minlength=radius + 1))
+    stages: list[tuple[int, int]] = []
+    first_ring = 0
+    while first_ring <= radius:
+        last_ring = min(2 * first_ring, radius)
+        start = int(ring_end[first_ring - 1]) if first_ring > 0 else 0
+        stages.append((start, int(ring_end[last_ring])))
+        first_ring = last_ring + 1
+    for column in (dx, dy, dist):
+        column.setflags(write=False)
+    return DiamondOffsets(dx, dy, dist, tuple(stages))
+
+
+def nearest_source_transform(
+    mask: np.ndarray, radius: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Manhattan distance from every cell to the nearest set cell of ``mask``.
+
+    Returns ``(dist, source)``: ``dist`` is capped at ``radius + 1`` and
+    ``source`` holds the flat index of the nearest set cell, or -1 when none
+    lies within ``radius``. Ties go to the lowest flat index, which is the
+    order ``diamond_offsets`` visits them in. Two separable passes of forward
+    and backward sweeps, first along rows then along columns.
+    """
+    height, width = mask.shape
+    none = height * width
+    dist = np.where(mask, 0, radius + 1).astype(np.int32)
+    source = np.where(mask, np.arange(none).reshape(mask.shape), none)
+    for axis in (1, 0):
+        d = np.moveaxis(dist, axis, 0)
+        s = np.moveaxis(source, axis, 0)
+        length = d.shape[0]
+        forward = [(k - 1, k) for k in range(1, length)]
+        backward = [(k + 1, k) for k in range(length - 2, -1, -1)]
+        for i, j in forward + backward:
+            step = d[i] + 1
+            closer = (step < d[j]) | ((step == d[j]) & (s[i] < s[j]))
+            better = closer & (step <= radius)
+            d[j] = np.where(better, step, d[j])
+            s[j] = np.where(better, s[i], s[j])
+    source[source == none] = -1
+    return dist, source
+
+
+def energy_colors(energy: np.ndarray) -> np.ndarray:
+    """RGB colour of blobs with the given energies, from blue (starving) to
+    green (well fed), as one ``uint8`` row per blob."""
+    energy = np.asarray(energy, dtype=np.int64)
+    colors = np.zeros(energy.shape + (3,), dtype=np.uint8)
+    colors[..., 1] = np.clip(energy * 5, 0, 255)
+    colors[..., 2] = np.clip(255 - energy * 5, 0, 255)
+    return colors
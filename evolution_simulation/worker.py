@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import gc
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from . import constants as C
+from .checkpoint import save_checkpoint
+from .entities import ACTION_NAMES
+from .render import GridRenderer
+from .simulation import Simulation
+from .utils import energy_colors
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Read-only copy of everything the UI draws after one turn.
+
+    Per-blob arrays have one row per live blob; ``cells`` maps every cell to
+    the row of the blob drawn there, or -1 when the cell is empty or its blob
+    is hidden under food. The arrays are copies flagged read-only, so a
+    snapshot stays valid however far the simulation has moved on.
+
+    When ``image_key`` is given, ``image`` holds the grid image the renderer
+    draws at that level, built here on the worker thread.
+    """
+
+    turn: int
+    extinct: bool
+    turn_rate: float
+    food: np.ndarray
+    cells: np.ndarray
+    ids: np.ndarray
+    xs: np.ndarray
+    ys: np.ndarray
+    energy: np.ndarray
+    colors: np.ndarray
+    birth_turn: np.ndarray
+    last_action: np.ndarray
+    action_totals: np.ndarray
+    best: int
+    oldest: int
+    population: int
+    food_count: int
+    energy_total: int
+    action_counts: np.ndarray
+    image: np.ndarray | None = None
+    image_key: tuple[str, int] | None = None
+
+    @classmethod
+    def capture(
+        cls,
+        sim: Simulation,
+        turn_rate: float = 0.0,
+        image_key: tuple[str, int] | None = None,
+    ) -> Snapshot:
+        grid = sim.grid
+        grid.update_data()
+        table = grid.blobs
+        slots = table.live_slots()
+        blobs = [table.objects[slot] for slot in slots]
+        rows = np.arange(len(slots), dtype=np.int32)
+        xs = table.x[slots]
+        ys = table.y[slots]
+        cells = np.full(grid.food.shape, -1, dtype=np.int32)
+        cells[xs, ys] = rows
+        # Food on a cell hides the blob standing on it
+        cells[grid.food > 0] = -1
+        energy = table.energy[slots]
+        row_of_slot = dict(zip(slots.tolist(), rows.tolist()))
+        best = grid.better_blob
+        oldest = grid.oldest_blob
+        action_totals = np.array(
+            [blob.action_totals for blob in blobs], dtype=np.int64
+        ).reshape(len(blobs), len(ACTION_NAMES))
+        snapshot = cls(
+            turn=sim.turn,
+            extinct=sim.extinct,
+            turn_rate=turn_rate,
+            food=_frozen(grid.food.copy()),
+            cells=_frozen(cells),
+            ids=_frozen(np.array([blob.id for blob in blobs], dtype=np.int64)),
+            xs=_frozen(xs),
+            ys=_frozen(ys),
+            energy=_frozen(energy),
+            colors=_frozen(energy_colors(energy)),
+            birth_turn=_frozen(table.birth_turn[slots]),
+            last_action=_frozen(table.last_action[slots]),
+            action_totals=_frozen(action_totals),
+            best=row_of_slot[best.slot] if best else -1,
+            oldest=row_of_slot[oldest.slot] if oldest else -1,
+            population=grid.population,
+            food_count=grid.food_count,
+            energy_total=int(table.totals["energy"]),
+            action_counts=_frozen(table.action_counts.copy()),
+        )
+        if image_key is None:
+            return snapshot
+        image = _frozen(GridRenderer.image(snapshot, image_key))
+        return replace(snapshot, image=image, image_key=image_key)
+
+    @property
+    def size(self) -> int:
+        return int(self.food.shape[0])
+
+    def blob_at(self, x: int, y: int) -> int:
+        """Row of the blob drawn on cell (x, y), or -1."""
+        return int(self.cells[x, y])
+
+    def age(self, row: int) -> int:
+        return self.turn - int(self.birth_turn[row])
+
+    def last_behaviour(self, row: int) -> str:
+        last = int(self.last_action[row])
+        return ACTION_NAMES[last] if last >= 0 else "none"
+
+    def behaviour_percentages(self, row: int) -> dict[str, float]:
+        totals = self.action_totals[row]
+        taken = int(totals.sum())
+        if taken == 0:
+            return dict.fromkeys(ACTION_NAMES, 0.0)
+        return {
+            name: count * 100.0 / taken
+            for name, count in zip(ACTION_NAMES, totals.tolist())
+        }
+
+
+class SimulationWorker(threading.Thread):
+    """Steps a ``Simulation`` on its own thread, paced to ``turns_per_second``.
+
+    After every turn the worker captures a ``Snapshot`` (the back buffer) and
+    publishes it by swapping it into the front with a single reference
+    assignment, so ``latest()`` never blocks and never sees a half-built
+    turn.
+
+    In turbo mode the pacing is dropped: each UI frame the worker plays as
+    many turns as it expects to fit in ``frame_budget`` seconds (from a
+    running average of the turn time, and always at least one), publishes
+    one snapshot for the whole batch, then leaves the rest of the frame to
+    the UI thread.
+
+    The UI must not touch the simulation while the worker runs; it sends
+    changes through ``send()`` instead:
+
+    - ``("params", {name: value})``: update ``sim.params`` fields
+    - ``("rate", turns_per_second)``
+    - ``("pause", bool)``
+    - ``("turbo", bool)``
+    - ``("budget", milliseconds)``: turbo time budget per frame
+    - ``("image", (level, factor))``: grid image to build with each
+      snapshot, or None (see ``GridRenderer.image_key``)
+    - ``("checkpoint", path)``: save the world between two turns; the file
+      is written in the background
+    - ``("stop", None)``
+
+    When the population dies out, ``on_extinction(sim)`` is called on the
+    worker thread, a last snapshot with ``extinct`` set is published and the
+    thread ends.
+    """
+
+    GC_EVERY_TURNS: int = 100
+    # Weight of the latest batch in the running average of the turn time
+    TURN_TIME_SMOOTHING: float = 0.3
+
+    def __init__(
+        self,
+        sim: Simulation,
+        turns_per_second: float = 30,
+        on_extinction: Callable[[Simulation], None] | None = None,
+    ) -> None:
+        super().__init__(name="simulation", daemon=True)
+        self.sim = sim
+        self.turns_per_second = turns_per_second
+        self.on_extinction = on_extinction
+        self.paused = False
+        self.stopped = False
+        self.turbo = False
+        self.frame_budget = C.TURBO_FRAME_BUDGET_MS / 1000
+        self.frame_period = 1 / C.UI_FPS
+        self.turn_time = 0.0
+        # (time, turn) of recent publishes, for the achieved turns per second
+        self.published: deque[tuple[float, int]] = deque(maxlen=32)
+        self.commands: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self.writer: threading.Thread | None = None
+        self.image_key: tuple[str, int] | None = None
+        self._front = Snapshot.capture(sim)
+
+    def latest(self) -> Snapshot:
+        return self._front
+
+    def send(self, command: str, value: Any = None) -> None:
+        self.commands.put((command, value))
+
+    def stop(self, timeout: float | None = None) -> None:
+        self.send("stop")
+        if self.is_alive():
+            self.join(timeout)
+
+    def apply(self, command: str, value: Any) -> None:
+        if command == "params":
+            for name, param in value.items():
+                setattr(self.sim.params, name, param)
+        elif command == "rate":
+            self.turns_per_second = value
+        elif command == "pause":
+            self.paused = bool(value)
+        elif command == "turbo":
+            self.turbo = bool(value)
+        elif command == "budget":
+            self.frame_budget = value / 1000
+        elif command == "image":
+            self.image_key = value
+        elif command == "checkpoint":
+            if self.writer is not None:
+                # One file at a time; a second save waits for the first
+                self.writer.join()
+            self.writer = save_checkpoint(self.sim, value, background=True)
+        elif command == "stop":
+            self.stopped = True
+        else:
+            raise ValueError(f"unknown worker command {command!r}")
+
+    def play_batch(self) -> int:
+        """Play one turn, or as many as fit in the frame budget in turbo
+        mode; returns the number played."""
+        started = time.perf_counter()
+        played = 0
+        while True:
+            self.sim.step()
+            played += 1
+            if self.sim.turn % self.GC_EVERY_TURNS == 0:
+                gc.collect()
+            if not self.turbo or self.sim.extinct:
+                break
+            elapsed = time.perf_counter() - started
+            if elapsed + (self.turn_time or elapsed / played) > self.frame_budget:
+                break
+        turn_time = (time.perf_counter() - started) / played
+        smoothing = self.TURN_TIME_SMOOTHING if self.turn_time else 1.0
+        self.turn_time += smoothing * (turn_time - self.turn_time)
+        return played
+
+    def turn_rate(self) -> float:
+        """Turns per second achieved over the recent publishes."""
+        if len(self.published) < 2:
+            return 0.0
+        (first_time, first_turn), (last_time, last_turn) = (
+            self.published[0],
+            self.published[-1],
+        )
+        return (last_turn - first_turn) / max(last_time - first_time, 1e-9)
+
+    def run(self) -> None:
+        next_turn = time.perf_counter()
+        while not self.stopped:
+            # Commands are handled while waiting for the next turn; a paused
+            # worker sleeps until one arrives
+            timeout = None
+            if not self.paused:
+                timeout = max(0.0, next_turn - time.perf_counter())
+            try:
+                self.apply(*self.commands.get(timeout=timeout))
+                continue
+            except queue.Empty:
+                pass
+            started = time.perf_counter()
+            self.play_batch()
+            if self.sim.extinct and self.on_extinction is not None:
+                self.on_extinction(self.sim)
+            now = time.perf_counter()
+            self.published.append((now, self.sim.turn))
+            back = Snapshot.capture(self.sim, self.turn_rate(), self.image_key)
+            self._front = back
+            if back.extinct:
+                break
+            if self.turbo:
+                # Hand the rest of the frame (and at least a millisecond) to
+                # the UI thread before the next batch
+                next_turn = max(started + self.frame_period, now + 1e-3)
+            else:
+                next_turn = max(
+                    next_turn + 1 / max(self.turns_per_second, 1e-6),
+                    time.perf_counter(),
+                )
@@ -1,4 +1,66 @@
-from evolution_simulation.game import main
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from evolution_simulation import constants as C
+
+if TYPE_CHECKING:
+    from evolution_simulation.entities import Brain
+
+
+def run_headless(
+    turns: int,
+    grid_size: int,
+    resume: str | None = None,
+    checkpoint: str | None = None,
+    genomes: list[Brain] | None = None,
+    seed: int | None = None,
+) -> None:
+    from evolution_simulation.checkpoint import load_checkpoint, save_checkpoint
+    from evolution_simulation.simulation import Simulation, SimulationParams
+
+    if resume:
+        sim = load_checkpoint(resume)
+    else:
+        sim = Simulation(
+            SimulationParams(TAILLE_GRID=grid_size), genomes=genomes, rng=seed
+        )
+    start = time.perf_counter()
+    played = sim.run(turns)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{played} turns in {elapsed:.2f}s "
+        f"({played / max(elapsed, 1e-9):.1f} turns/s), "
+        f"{sim.grid.population} blobs alive"
+    )
+    if checkpoint:
+        save_checkpoint(sim, checkpoint)
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Evolution Simulation")
+    parser.add_argument("--headless", action="store_true", help="run without a display")
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--grid", type=int, default=C.TAILLE_GRID, help="grid size")
+    parser.add_argument("--resume", help="start from this checkpoint (.npz)")
+    parser.add_argument("--checkpoint", help="save the final world to this .npz")
+    parser.add_argument("--seed", type=int, help="replay the run of this seed")
+    parser.add_argument(
+        "--genomes",
+        help="seed new runs with the genomes of this archive (e.g. "
+        f"{C.GENOME_ARCHIVE})",
+    )
+    args = parser.parse_args()
+    from evolution_simulation.genomes import GenomeArchive
+
+    genomes = GenomeArchive(args.genomes).brains() if args.genomes else None
+    if args.headless:
+        run_headless(
+            args.turns, args.grid, args.resume, args.checkpoint, genomes, args.seed
+        )
+    else:
+        from evolution_simulation.game import main
+
+        main(genomes)